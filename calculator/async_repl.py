@@ -0,0 +1,215 @@
+"""
+async_repl.py
+An asyncio-based REPL that can run long commands as background jobs.
+
+Appending '&' to a command (e.g. 'save_history &') starts it as a job and
+returns to the prompt straight away; 'jobs' lists jobs and 'wait <id>'
+blocks until one finishes. Every command that reads or changes the
+calculator's history runs on a single-thread executor, so those commands
+(foreground or background) execute one at a time in the order they were
+entered. Other commands run on the default thread pool so the event loop
+stays free to report finished jobs.
+
+The prompt is read on its own daemon thread rather than the default
+executor: asyncio.run waits for the default executor on shutdown, so a
+thread blocked in input() would keep Ctrl-C from exiting.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from calculator.logger import LoggerSingleton
+from calculator.repl import REPL
+
+LOGGER = LoggerSingleton.get_logger()
+
+# Commands that read or change shared state (history, variables); together
+# with arithmetic they run one at a time on the serial executor.
+SERIALIZED_COMMANDS = {
+    "history", "clear_history", "delete_history_file",
+    "save_history", "load_history", "replay", "let", "vars",
+}
+
+class Job:
+    """A command running in the background."""
+    def __init__(self, job_id, command, future):
+        self.job_id = job_id
+        self.command = command
+        self.future = future
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return "running"
+        if self.future.exception() is not None:
+            return f"failed: {self.future.exception()}"
+        return "done"
+
+    def describe(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return f"[{self.job_id}] {self.status:<10} {end - self.started:7.2f}s  {self.command}"
+
+class PromptReader:
+    """Reads prompt lines on a daemon thread, one line per `readline()` call."""
+    def __init__(self, prompt=">> "):
+        self.prompt = prompt
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="prompt-reader", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            loop, future = self._requests.get()
+            try:
+                outcome = (input(self.prompt), None)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                outcome = (None, exc)
+            try:
+                loop.call_soon_threadsafe(_settle, future, *outcome)
+            except RuntimeError:
+                pass  # The event loop has already closed.
+
+    async def readline(self):
+        """Return the next line; raises EOFError at end of input."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.put((loop, future))
+        return await future
+
+def _settle(future, line, exc):
+    if future.cancelled():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(line)
+
+class AsyncREPL(REPL):
+    """REPL variant whose prompt stays responsive while background jobs run."""
+    def __init__(self, history_file="history/history.csv"):
+        super().__init__(history_file=history_file)
+        self.jobs = {}
+        self._history_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="history-jobs"
+        )
+        self.async_commands = {"jobs": self.cmd_jobs, "wait": self.cmd_wait}
+        self._reader = None
+
+    def start(self):
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self._exit_on_interrupt()
+
+    def _exit_on_interrupt(self):
+        """
+        Ctrl-C: drop queued jobs, let a running history command finish, then exit.
+        The prompt thread may be blocked in input() holding stdin's lock, which a
+        normal interpreter shutdown can abort on, so the process exits directly.
+        """
+        print("\nInterrupted. Goodbye!")
+        LOGGER.info("Async REPL interrupted; exiting.")
+        self._history_executor.shutdown(wait=True, cancel_futures=True)
+        if self.plugin_pool is not None:
+            self.plugin_pool.shutdown()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        logging.shutdown()
+        os._exit(130)  # pylint: disable=protected-access
+
+    async def run(self):
+        self._show_welcome()
+        if self._reader is None:
+            self._reader = PromptReader()
+        while True:
+            try:
+                user_input = (await self._reader.readline()).strip()
+            except EOFError:
+                user_input = "exit"
+            if not user_input:
+                continue
+            background = user_input.endswith("&")
+            if background:
+                user_input = user_input[:-1].strip()
+                if user_input:
+                    self.start_job(user_input)
+                continue
+            cmd = user_input.split()[0].lower()
+            if cmd in self.async_commands:
+                await self.async_commands[cmd](user_input.split())
+            elif cmd == "exit":
+                await self.wait_for_jobs()
+                self._history_executor.shutdown()
+                self.cmd_exit([])
+            else:
+                await self.run_command(user_input)
+
+    def touches_history(self, cmd):
+        return cmd in SERIALIZED_COMMANDS or cmd in self.arithmetic_cmds
+
+    async def run_command(self, user_input):
+        """Run one line on the right executor and wait for it."""
+        cmd = user_input.split()[0].lower()
+        executor = self._history_executor if self.touches_history(cmd) else None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, self.dispatch, user_input)
+
+    def start_job(self, user_input):
+        """Start `user_input` as a background job and return the Job (or None)."""
+        cmd = user_input.split()[0].lower()
+        if cmd in self.async_commands or cmd == "exit":
+            print(f"'{cmd}' cannot run in the background.")
+            return None
+        if cmd in self.plugins and cmd not in self.isolated_plugins:
+            # In-process plugins read from stdin, which the prompt is using.
+            print(f"Plugin '{cmd}' reads from the prompt; run it in the foreground.")
+            return None
+        job_id = len(self.jobs) + 1
+        job = Job(job_id, user_input, asyncio.ensure_future(self.run_command(user_input)))
+        job.future.add_done_callback(lambda _future: self._job_finished(job))
+        self.jobs[job_id] = job
+        print(f"[{job_id}] started: {user_input}")
+        LOGGER.info("Background job %d started: %s", job_id, user_input)
+        return job
+
+    def _job_finished(self, job):
+        job.finished = time.perf_counter()
+        print(f"\n[{job.job_id}] {job.status}: {job.command}")
+        LOGGER.info("Background job %d %s after %.3fs", job.job_id, job.status,
+                    job.finished - job.started)
+
+    async def wait_for_jobs(self):
+        running = [job.future for job in self.jobs.values() if not job.future.done()]
+        if running:
+            print(f"Waiting for {len(running)} background job(s) to finish...")
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def cmd_jobs(self, _parts):
+        if not self.jobs:
+            print("No background jobs.")
+        for job in self.jobs.values():
+            print(job.describe())
+
+    async def cmd_wait(self, parts):
+        if len(parts) < 2:
+            await self.wait_for_jobs()
+            return
+        try:
+            job = self.jobs[int(parts[1])]
+        except (ValueError, KeyError):
+            print(f"Error: no job with id '{parts[1]}'.")
+            return
+        await asyncio.gather(job.future, return_exceptions=True)
+        print(job.describe())
+
+    def show_menu(self):
+        super().show_menu()
+        print("Background Jobs:")
+        print("  <command> &, jobs, wait [id]\n")
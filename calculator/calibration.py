@@ -0,0 +1,139 @@
+"""
+calibration.py
+Scalar/vector crossover sizes for the calculator commands.
+
+Every command can run a batch either element by element through its scalar
+`execute` (`execute_scalar_batch`) or through its NumPy kernel
+(`execute_batch`). NumPy has a fixed per-call overhead, so it only wins
+above some batch size, and that size depends on the machine and the
+operation. `calibrate` times both paths on doubling batch sizes and keeps,
+for each operation, the smallest size from which the vector path is
+faster. The result is cached as JSON keyed by host name and NumPy version,
+so the benchmark runs once per machine. CALIBRATION_FILE overrides the
+cache location.
+
+`python -m calculator.main --calibrate` re-runs the benchmark and prints
+the thresholds for this host.
+"""
+
+import json
+import os
+import socket
+import time
+import numpy as np
+from calculator.commands import Command
+from calculator.logger import LoggerSingleton
+
+LOGGER = LoggerSingleton.get_logger()
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "calcy", "calibration.json")
+SIZES = tuple(2 ** i for i in range(13))  # 1 .. 4096
+
+def cache_path():
+    return os.environ.get("CALIBRATION_FILE", DEFAULT_CACHE_FILE)
+
+def host_key():
+    """Cache key: thresholds are only valid for this machine and NumPy build."""
+    return f"{socket.gethostname()}/numpy-{np.__version__}"
+
+def _best_time(func, a, b, repeats):
+    """Best per-call time; small sizes are looped so each sample is long enough to time."""
+    number = max(1, 256 // len(a))
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            func(a, b)
+        best = min(best, time.perf_counter() - started)
+    return best / number
+
+def crossover(command, sizes=SIZES, repeats=3):
+    """
+    Smallest size in `sizes` from which `command.execute_batch` beats
+    `command.execute_scalar_batch` (at that size and the next one, to ride
+    out timer noise). None means the scalar path should always be used.
+    """
+    if type(command).execute_batch is Command.execute_batch:
+        return None
+    rng = np.random.default_rng(0)
+    candidate = None
+    for size in sizes:
+        a = rng.uniform(1.0, 100.0, size)
+        b = rng.uniform(1.0, 100.0, size)
+        scalar = _best_time(command.execute_scalar_batch, a, b, repeats)
+        vector = _best_time(command.execute_batch, a, b, repeats)
+        if vector >= scalar:
+            candidate = None
+        elif candidate is None:
+            candidate = size
+        else:
+            return candidate
+    return candidate
+
+class Calibration:
+    """Per-operation thresholds: batches at least this large use the vector path."""
+    def __init__(self, thresholds, host=None):
+        self.thresholds = dict(thresholds)
+        self.host = host or host_key()
+
+    def threshold(self, operation):
+        return self.thresholds.get(operation)
+
+    def use_vector(self, operation, size):
+        threshold = self.thresholds.get(operation)
+        return threshold is not None and size >= threshold
+
+    @classmethod
+    def run(cls, operation_map, sizes=SIZES, repeats=3):
+        started = time.perf_counter()
+        thresholds = {name: crossover(cmd, sizes, repeats) for name, cmd in operation_map.items()}
+        LOGGER.info("Calibrated scalar/vector thresholds in %.3fs: %s",
+                    time.perf_counter() - started, thresholds)
+        return cls(thresholds)
+
+    @staticmethod
+    def _read_cache(path):
+        try:
+            with open(path, encoding="utf-8") as cache:
+                return json.load(cache)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            LOGGER.error("Ignoring unreadable calibration cache %s: %s", path, exc)
+            return {}
+
+    @classmethod
+    def load(cls, path=None):
+        """Return the cached Calibration for this host, or None."""
+        thresholds = cls._read_cache(path or cache_path()).get(host_key())
+        return None if thresholds is None else cls(thresholds)
+
+    def save(self, path=None):
+        """Store this host's thresholds, keeping entries for other hosts."""
+        path = path or cache_path()
+        entries = self._read_cache(path)
+        entries[self.host] = self.thresholds
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache:
+            json.dump(entries, cache, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load_or_run(cls, operation_map, path=None, force=False):
+        """Use the cached thresholds if they cover every operation, else calibrate."""
+        calibration = None if force else cls.load(path)
+        if calibration is None or set(operation_map) - set(calibration.thresholds):
+            calibration = cls.run(operation_map)
+            try:
+                calibration.save(path)
+            except OSError as exc:
+                LOGGER.error("Could not write calibration cache: %s", exc)
+        return calibration
+
+    def format(self):
+        lines = [f"Scalar/vector thresholds for {self.host}:"]
+        for operation, threshold in sorted(self.thresholds.items()):
+            shown = "always scalar" if threshold is None else f"vector from {threshold} rows"
+            lines.append(f"  {operation:<8} {shown}")
+        return "\n".join(lines)
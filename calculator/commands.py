@@ -1,11 +1,15 @@
 """
 commands.py
 Command pattern for calculator operations: add, sub, mul, div, sqrt, square, cube, log.
+Each command has a scalar `execute` and an array-based `execute_batch`;
+`execute_scalar_batch` applies `execute` element by element, which is
+faster than NumPy for small inputs (see calibration.py).
 """
 
 import math
 from abc import ABC, abstractmethod
-from calculator.exceptions import DivisionByZeroError
+import numpy as np
+from calculator.exceptions import CalculatorError, DivisionByZeroError
 
 class Command(ABC):
     """Abstract base class for any calculator command."""
@@ -13,21 +17,58 @@ class Command(ABC):
     def execute(self, a, b):
         pass
 
+    def execute_batch(self, a, b):
+        """
+        Execute the command over arrays of operands.
+        Inputs the scalar command would reject produce NaN instead of raising.
+        Subclasses override this with a vectorized NumPy kernel; the default
+        falls back to `execute_scalar_batch`.
+        """
+        return self.execute_scalar_batch(a, b)
+
+    def execute_scalar_batch(self, a, b):
+        """Same contract as `execute_batch`, calling `execute` once per element."""
+        results = []
+        for x, y in zip(_as_floats(a), _as_floats(b)):
+            try:
+                results.append(self.execute(x, y))
+            except (CalculatorError, ArithmeticError, ValueError):
+                results.append(math.nan)
+        return np.array(results, dtype=float)
+
+def _as_floats(values):
+    """Plain Python floats: scalar arithmetic on them is much cheaper than on NumPy scalars."""
+    if isinstance(values, np.ndarray):
+        return values.astype(float, copy=False).tolist()
+    return [float(value) for value in values]
+
 class AddCommand(Command):
     """Add two numbers."""
     def execute(self, a, b):
         return a + b
 
+    def execute_batch(self, a, b):
+        with np.errstate(over="ignore", invalid="ignore"):
+            return np.add(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
 class SubCommand(Command):
     """Subtract b from a."""
     def execute(self, a, b):
         return a - b
 
+    def execute_batch(self, a, b):
+        with np.errstate(over="ignore", invalid="ignore"):
+            return np.subtract(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
 class MulCommand(Command):
     """Multiply a by b."""
     def execute(self, a, b):
         return a * b
 
+    def execute_batch(self, a, b):
+        with np.errstate(over="ignore", invalid="ignore"):
+            return np.multiply(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+
 class DivCommand(Command):
     """Divide a by b."""
     def execute(self, a, b):
@@ -35,6 +76,12 @@ class DivCommand(Command):
             raise DivisionByZeroError("Cannot divide by zero.")
         return a / b
 
+    def execute_batch(self, a, b):
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            return np.where(b == 0, np.nan, a / b)
+
 class SqrtCommand(Command):
     """Square root of a."""
     def execute(self, a, _):
@@ -42,19 +89,41 @@ class SqrtCommand(Command):
             raise ValueError("Cannot take sqrt of a negative number.")
         return math.sqrt(a)
 
+    def execute_batch(self, a, _b):
+        a = np.asarray(a, dtype=float)
+        with np.errstate(invalid="ignore"):
+            return np.where(a < 0, np.nan, np.sqrt(a))
+
 class SquareCommand(Command):
     """Square of a."""
     def execute(self, a, _):
         return a * a
 
+    def execute_batch(self, a, _b):
+        a = np.asarray(a, dtype=float)
+        with np.errstate(over="ignore"):
+            return a * a
+
 class CubeCommand(Command):
     """Cube of a."""
     def execute(self, a, _ignored):
         return a ** 3
 
+    def execute_batch(self, a, _ignored):
+        a = np.asarray(a, dtype=float)
+        with np.errstate(over="ignore"):
+            cubed = np.power(a, 3)
+        # `a ** 3` raises OverflowError for large finite a, which the scalar path maps to NaN.
+        return np.where(np.isinf(cubed) & np.isfinite(a), np.nan, cubed)
+
 class LogCommand(Command):
     """Log base 10 of a."""
     def execute(self, a, _ignored):
         if a <= 0:
             raise ValueError("Cannot take log of a non-positive number.")
         return math.log10(a)
+
+    def execute_batch(self, a, _ignored):
+        a = np.asarray(a, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(a <= 0, np.nan, np.log10(a))
@@ -6,3 +6,7 @@ class CalculatorError(Exception):
     """Base exception for calculator errors.""" 
 class DivisionByZeroError(CalculatorError):
     """Raised when division by zero is attempted."""
+class PluginExecutionError(CalculatorError):
+    """Raised when a plugin fails while running in an isolated worker."""
+class PluginTimeoutError(CalculatorError):
+    """Raised when an isolated plugin does not finish within its timeout."""
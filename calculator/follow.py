@@ -0,0 +1,143 @@
+"""
+follow.py
+Tail/follow ingestion: process operation lines appended to a log file.
+
+`FollowIngestor` reads complete lines that have been appended to the file
+since the last poll and passes them, in micro-batches, to
+`REPL.handle_arithmetic_command` (the same dispatch the prompt uses).
+After each batch the new history records are appended to the history
+file (`HistoryFacade.flush`, which also drops them from memory so a long
+tail does not grow the process), and only then is the processed byte
+offset written to a checkpoint file. A restart resumes where it left off.
+If following is interrupted (e.g. Ctrl-C) mid-batch, the lines already
+processed are committed the same way. A hard crash between the history
+write and the checkpoint means those lines are processed again on
+restart (at-least-once).
+
+Rotation (the path now points to a different inode) is handled by reading
+whatever is left of the old file and then starting at the beginning of
+the new one. Truncation (the file shrank below the offset) restarts from
+the beginning.
+"""
+
+import json
+import os
+import time
+from calculator.logger import LoggerSingleton
+
+LOGGER = LoggerSingleton.get_logger()
+
+class FollowIngestor:
+    """Tails `path` and feeds new lines to a REPL's arithmetic dispatch."""
+    def __init__(self, path, repl, checkpoint_path=None, batch_size=100, poll_interval=0.5):
+        self.path = path
+        self.repl = repl
+        self.checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._handle = None
+        self._inode = None
+        self.offset = 0
+        self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as checkpoint:
+                state = json.load(checkpoint)
+            self._inode, self.offset = state["inode"], int(state["offset"])
+            LOGGER.info("Resuming %s at byte %d", self.path, self.offset)
+        except (OSError, ValueError, KeyError) as exc:
+            LOGGER.error("Ignoring unreadable checkpoint %s: %s", self.checkpoint_path, exc)
+
+    def _save_checkpoint(self):
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as checkpoint:
+            json.dump({"inode": self._inode, "offset": self.offset}, checkpoint)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _open(self, inode, offset):
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = open(self.path, "rb")  # pylint: disable=consider-using-with
+        self._inode = inode
+        self.offset = offset
+
+    def poll_once(self):
+        """Process every complete line available now. Returns the number of lines."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+        processed = 0
+        if self._handle is None:
+            resume = stat.st_ino == self._inode and stat.st_size >= self.offset
+            self._open(stat.st_ino, self.offset if resume else 0)
+        elif stat.st_ino != self._inode:
+            LOGGER.info("%s was rotated; finishing the old file first.", self.path)
+            processed += self._drain()
+            self._open(stat.st_ino, 0)
+        elif stat.st_size < self.offset:
+            LOGGER.warning("%s was truncated; starting again from the beginning.", self.path)
+            self.offset = 0
+        processed += self._drain()
+        return processed
+
+    def _drain(self):
+        """Read and dispatch complete lines from the current handle in batches."""
+        processed = 0
+        while True:
+            self._handle.seek(self.offset)
+            batch = []
+            while len(batch) < self.batch_size:
+                raw = self._handle.readline()
+                if not raw.endswith(b"\n"):
+                    break  # Nothing more, or a partial line still being written.
+                batch.append(raw)
+            if not batch:
+                return processed
+            consumed = 0
+            try:
+                for raw in batch:
+                    self.dispatch(raw.decode("utf-8", errors="replace"))
+                    consumed += len(raw)
+                    processed += 1
+            finally:
+                # Also on KeyboardInterrupt: commit the lines that were processed.
+                if consumed:
+                    self._commit(consumed)
+
+    def _commit(self, consumed):
+        """Persist the history records, then advance and save the offset."""
+        self.repl.calculator.history.flush(release=True)
+        self.offset += consumed
+        self._save_checkpoint()
+
+    def dispatch(self, line):
+        parts = line.split()
+        if not parts:
+            return
+        if not self.repl.handle_arithmetic_command(parts[0].lower(), parts):
+            LOGGER.warning("Skipping unsupported line from %s: %s", self.path, line.strip())
+
+    def run(self, max_idle_polls=None):
+        """
+        Follow the file until interrupted, or until `max_idle_polls`
+        consecutive polls find nothing new.
+        """
+        idle_polls = 0
+        try:
+            while max_idle_polls is None or idle_polls < max_idle_polls:
+                if self.poll_once():
+                    idle_polls = 0
+                else:
+                    idle_polls += 1
+                    time.sleep(self.poll_interval)
+        finally:
+            self.close()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -4,57 +4,243 @@ A Facade for Pandas-based history management.
 """
 
 import os
+import threading
+import time
 import pandas as pd
+from calculator.compact_history import CompactHistory, sequence_path
+from calculator.history_stats import HistoryStats
 from calculator.logger import LoggerSingleton
 
 LOGGER = LoggerSingleton.get_logger()
 
+COLUMNS = ["operation", "operand1", "operand2", "result"]
+
 class HistoryFacade:
     """
     Provides a simplified interface to read/write history
     from a CSV file using Pandas.
     The history file is stored in the "history" folder.
+
+    History can be loaded on a background thread with `load_history_async`.
+    Records added while that load is running are buffered and appended after
+    the loaded rows; every other operation waits for the load to finish.
+
+    Per-operation aggregates are kept in `stats` (see history_stats.py) and
+    updated on every add_record.
+
+    With compact=True, repeated (operation, operand1, operand2) triples are
+    stored once (see compact_history.py), both in memory and on disk, and
+    get_history() expands the full ordered log on demand.
     """
-    def __init__(self, filename="history/history.csv"):
+    def __init__(self, filename="history/history.csv", chunk_size=100_000, compact=False):
         self.filename = filename
+        self.chunk_size = chunk_size
         # Ensure the directory exists.
         dir_name = os.path.dirname(self.filename)
         if dir_name and not os.path.exists(dir_name):
             os.makedirs(dir_name)
-        self._history_df = pd.DataFrame(
-            columns=["operation", "operand1", "operand2", "result"]
-        )
+        self._history_df = pd.DataFrame(columns=COLUMNS)
+        self._lock = threading.RLock()
+        self._loaded = threading.Event()
+        self._loaded.set()
+        self._pending = []
+        self._pending_errors = []
+        self._rows_loaded = 0
+        self.stats = HistoryStats()
+        self._compact = CompactHistory() if compact else None
+        # Rows at the start of _history_df that are already in the file (see flush).
+        self._flushed_rows = 0
 
-    def load_history(self):
-        """Load history from CSV if file exists."""
+    @property
+    def is_loading(self):
+        """True while a background load is in progress."""
+        return not self._loaded.is_set()
+
+    def load_progress(self):
+        """Number of rows read so far by the current (or last) load."""
+        return self._rows_loaded
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until any background load has finished. Returns False on timeout."""
+        return self._loaded.wait(timeout)
+
+    @property
+    def is_compact(self):
+        return self._compact is not None
+
+    def _read_history(self):
+        """
+        Read the CSV in chunks, updating progress. Returns a DataFrame (or a
+        CompactHistory in compact mode), or None if unavailable.
+        """
+        self._rows_loaded = 0
         try:
-            if os.path.exists(self.filename):
-                self._history_df = pd.read_csv(self.filename)
-                LOGGER.info("History loaded from %s", self.filename)
-            else:
+            if not os.path.exists(self.filename):
                 LOGGER.warning("No history file found at %s. Using empty history.", self.filename)
+                return None
+            if self.is_compact:
+                compact = CompactHistory.load(self.filename)
+                self._rows_loaded = len(compact)
+                LOGGER.info("Compact history loaded from %s (%d unique of %d rows)",
+                            self.filename, compact.unique_count, len(compact))
+                return compact
+            if "count" in pd.read_csv(self.filename, nrows=0).columns:
+                # Written in compact mode: expand instead of reading the unique table as rows.
+                history_df = CompactHistory.load(self.filename).expand()
+                self._rows_loaded = len(history_df)
+                LOGGER.info("Compact history file %s expanded (%d rows)",
+                            self.filename, len(history_df))
+                return history_df
+            chunks = []
+            for chunk in pd.read_csv(self.filename, chunksize=self.chunk_size):
+                chunks.append(chunk)
+                self._rows_loaded += len(chunk)
+            LOGGER.info("History loaded from %s", self.filename)
+            if not chunks:
+                return pd.DataFrame(columns=COLUMNS)
+            return pd.concat(chunks, ignore_index=True)
         except (IOError, PermissionError) as e:
             LOGGER.error("Error loading history: %s", str(e))
+            return None
+
+    def load_history(self):
+        """Load history from CSV if file exists."""
+        self.wait_until_loaded()
+        loaded = self._read_history()
+        if loaded is not None:
+            with self._lock:
+                self._install(loaded)
+                self._rebuild_stats()
+
+    def _install(self, loaded):
+        if self.is_compact:
+            self._compact = loaded
+        else:
+            self._history_df = loaded
+            self._flushed_rows = len(loaded)
+
+    def _rebuild_stats(self):
+        if self.is_compact:
+            self.stats.rebuild(self._compact.to_frame(), weights="count")
+        else:
+            self.stats.rebuild(self._history_df)
+
+    def load_history_async(self):
+        """Start loading history from CSV on a background thread and return immediately."""
+        self.wait_until_loaded()
+        with self._lock:
+            self._pending = []
+            self._pending_errors = []
+            self._loaded.clear()
+        loader = threading.Thread(
+            target=self._load_in_background, name="history-loader", daemon=True
+        )
+        loader.start()
+
+    def _load_in_background(self):
+        started = time.perf_counter()
+        loaded = None
+        try:
+            loaded = self._read_history()
+        finally:
+            with self._lock:
+                if loaded is not None:
+                    self._install(loaded)
+                if self._pending:
+                    self._append_pending()
+                    LOGGER.info("Merged %d records added during history load.",
+                                len(self._pending))
+                self._rebuild_stats()
+                for operation in self._pending_errors:
+                    self.stats.record_error(operation)
+                self._pending = []
+                self._pending_errors = []
+                self._loaded.set()
+            LOGGER.info("Background history load finished in %.3fs",
+                        time.perf_counter() - started)
+
+    def _append_pending(self):
+        if self.is_compact:
+            for record in self._pending:
+                self._compact.add(**record)
+        else:
+            pending_df = pd.DataFrame(self._pending, columns=COLUMNS)
+            self._history_df = pd.concat([self._history_df, pending_df], ignore_index=True)
 
     def save_history(self):
         """Save the in-memory history DataFrame to CSV."""
+        self.wait_until_loaded()
         try:
-            self._history_df.to_csv(self.filename, index=False)
+            with self._lock:
+                history_df = self._history_df
+                if self.is_compact:
+                    # The compact store is mutable, so write it under the lock.
+                    self._compact.save(self.filename)
+            if not self.is_compact:
+                history_df.to_csv(self.filename, index=False)
+                with self._lock:
+                    self._flushed_rows = max(self._flushed_rows, len(history_df))
+                # A plain file makes any id sequence from an earlier compact save stale.
+                if os.path.exists(sequence_path(self.filename)):
+                    os.remove(sequence_path(self.filename))
             LOGGER.info("History saved to %s", self.filename)
         except (IOError, PermissionError) as e:
             LOGGER.error("Error saving history: %s", str(e))
 
+    def flush(self, release=False):
+        """
+        Append the records added since the last load/save/flush to the history
+        file, instead of rewriting it. With release=True the in-memory rows are
+        dropped afterwards (the statistics are kept), so an append-only writer
+        such as follow mode uses bounded memory; get_history() then only returns
+        records added since. Compact histories are saved in full. Unlike
+        save_history, write errors are raised (OSError), not just logged.
+        """
+        self.wait_until_loaded()
+        with self._lock:
+            if self.is_compact:
+                self._compact.save(self.filename)
+                return
+            new_rows = self._history_df.iloc[self._flushed_rows:]
+            if self._file_is_plain():
+                if not new_rows.empty:
+                    new_rows.to_csv(self.filename, mode="a", header=False, index=False)
+            else:
+                # No file yet, or one written in compact mode: write everything.
+                self._history_df.to_csv(self.filename, index=False)
+                if os.path.exists(sequence_path(self.filename)):
+                    os.remove(sequence_path(self.filename))
+            if release:
+                self._history_df = pd.DataFrame(columns=COLUMNS)
+                self._flushed_rows = 0
+            else:
+                self._flushed_rows = len(self._history_df)
+        LOGGER.info("Flushed %d record(s) to %s", len(new_rows), self.filename)
+
+    def _file_is_plain(self):
+        """True if the history file exists and has the plain (non-compact) layout."""
+        if not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0:
+            return False
+        return "count" not in pd.read_csv(self.filename, nrows=0).columns
+
     def clear_history(self):
         """Clear in-memory history (does not remove file)."""
-        self._history_df = pd.DataFrame(
-            columns=["operation", "operand1", "operand2", "result"]
-        )
+        self.wait_until_loaded()
+        with self._lock:
+            self._history_df = pd.DataFrame(columns=COLUMNS)
+            self._flushed_rows = 0
+            if self.is_compact:
+                self._compact = CompactHistory()
+            self.stats.reset()
         LOGGER.info("History cleared in memory.")
 
     def delete_history_file(self):
         """Delete the CSV file from disk."""
+        self.wait_until_loaded()
         if os.path.exists(self.filename):
             os.remove(self.filename)
+            if os.path.exists(sequence_path(self.filename)):
+                os.remove(sequence_path(self.filename))
             LOGGER.info("History file %s deleted.", self.filename)
         else:
             LOGGER.warning("No history file found to delete at %s", self.filename)
@@ -67,11 +253,67 @@ class HistoryFacade:
             "operand2": operand2,
             "result": result
         }
-        # Create a DataFrame with explicit columns to avoid FutureWarning.
-        new_df = pd.DataFrame([new_record], columns=self._history_df.columns)
-        self._history_df = pd.concat([self._history_df, new_df], ignore_index=True)
+        with self._lock:
+            if self.is_loading:
+                self._pending.append(new_record)
+            elif self.is_compact:
+                self._compact.add(operation, operand1, operand2, result)
+                self.stats.update(operation, result)
+            else:
+                # Create a DataFrame with explicit columns to avoid FutureWarning.
+                new_df = pd.DataFrame([new_record], columns=self._history_df.columns)
+                self._history_df = pd.concat([self._history_df, new_df], ignore_index=True)
+                self.stats.update(operation, result)
         LOGGER.info("Record added: %s", new_record)
 
+    def record_error(self, operation):
+        """Count a failed operation in the running statistics (not stored as a row)."""
+        with self._lock:
+            if self.is_loading:
+                self._pending_errors.append(operation)
+            else:
+                self.stats.record_error(operation)
+
+    def get_stats(self):
+        """Return the per-operation aggregates as a DataFrame."""
+        self.wait_until_loaded()
+        with self._lock:
+            return self.stats.to_frame()
+
+    def memory_usage(self):
+        """Report the in-memory footprint of the history store."""
+        with self._lock:
+            if self.is_compact:
+                usage = {
+                    "rows": len(self._compact),
+                    "unique_rows": self._compact.unique_count,
+                    "compact_bytes": self._compact.memory_bytes(),
+                }
+            else:
+                usage = {
+                    "rows": len(self._history_df),
+                    "dataframe_bytes": int(self._history_df.memory_usage(deep=True).sum()),
+                }
+            usage["pending_records"] = len(self._pending)
+            usage["stats_operations"] = len(self.stats)
+            return usage
+
+    def cache_usage(self):
+        """Report the history's caches: the compact store's key index, if any."""
+        with self._lock:
+            if not self.is_compact:
+                return {}
+            return {
+                "compact_key_index": {
+                    "entries": self._compact.unique_count,
+                    "bytes": self._compact.key_index_bytes(),
+                },
+            }
+
     def get_history(self):
         """Return the current DataFrame of history."""
+        self.wait_until_loaded()
+        if self.is_compact:
+            with self._lock:
+                return self._compact.expand()
         return self._history_df
@@ -0,0 +1,136 @@
+"""
+history_stats.py
+Running per-operation aggregates over the calculation history.
+
+Counts, sums, mean/variance (Welford's algorithm), min and max are updated
+in O(1) per record, so `history stats` does not need a pass over the
+DataFrame. After a load or clear the aggregates are rebuilt in a single
+vectorized groupby.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+
+STAT_COLUMNS = ["count", "sum", "mean", "variance", "min", "max", "errors"]
+
+class OperationStats:
+    """Running aggregates for a single operation."""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.error_count = 0
+
+    @property
+    def variance(self):
+        """Population variance of the results seen so far."""
+        return self.m2 / self.count if self.count else 0.0
+
+    def update(self, value):
+        """Fold one result in; non-numeric or non-finite results count as errors."""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = math.nan
+        if not math.isfinite(value):
+            self.error_count += 1
+            return
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def as_row(self):
+        empty = self.count == 0
+        return [
+            self.count, self.total, self.mean, self.variance,
+            math.nan if empty else self.minimum,
+            math.nan if empty else self.maximum,
+            self.error_count,
+        ]
+
+def _weighted_aggregates(operations, results, counts):
+    """Per-operation count/sum/mean/variance/min/max where row i occurs counts[i] times."""
+    frame = pd.DataFrame({"w": counts, "x": results, "wx": counts * results})
+    grouped = frame.groupby(operations)
+    totals = grouped[["w", "wx"]].sum()
+    means = totals["wx"] / totals["w"]
+    frame["sq"] = frame["w"] * (frame["x"] - operations.map(means)) ** 2
+    return pd.DataFrame({
+        "count": totals["w"],
+        "sum": totals["wx"],
+        "mean": means,
+        "variance": frame.groupby(operations)["sq"].sum() / totals["w"],
+        "min": grouped["x"].min(),
+        "max": grouped["x"].max(),
+    })
+
+class HistoryStats:
+    """Per-operation running aggregates for a HistoryFacade."""
+    def __init__(self):
+        self._by_operation = {}
+
+    def __len__(self):
+        return len(self._by_operation)
+
+    def _entry(self, operation):
+        if operation not in self._by_operation:
+            self._by_operation[operation] = OperationStats()
+        return self._by_operation[operation]
+
+    def update(self, operation, result):
+        self._entry(operation).update(result)
+
+    def record_error(self, operation):
+        self._entry(operation).error_count += 1
+
+    def reset(self):
+        self._by_operation = {}
+
+    def rebuild(self, history_df, weights=None):
+        """
+        Recompute every aggregate from `history_df` in one vectorized pass.
+        `weights` names a column of per-row occurrence counts (used for the
+        compact history, where each row stands for several records).
+        """
+        self.reset()
+        if history_df.empty:
+            return
+        operations = history_df["operation"].astype(str)
+        results = pd.to_numeric(history_df["result"], errors="coerce").astype(float)
+        if weights is None:
+            counts = pd.Series(1, index=history_df.index)
+        else:
+            counts = history_df[weights].astype(int)
+        valid = np.isfinite(results.to_numpy())
+        aggregates = _weighted_aggregates(operations[valid], results[valid], counts[valid])
+        error_counts = pd.Series(np.where(valid, 0, counts), index=history_df.index)
+        for operation, error_count in error_counts.groupby(operations).sum().items():
+            entry = self._entry(operation)
+            entry.error_count = int(error_count)
+            if operation in aggregates.index:
+                row = aggregates.loc[operation]
+                entry.count = int(row["count"])
+                entry.total = float(row["sum"])
+                entry.mean = float(row["mean"])
+                entry.m2 = float(row["variance"]) * entry.count
+                entry.minimum = float(row["min"])
+                entry.maximum = float(row["max"])
+
+    def get(self, operation):
+        """Return the OperationStats for `operation`, or None if never seen."""
+        return self._by_operation.get(operation)
+
+    def to_frame(self):
+        """Return the aggregates as a DataFrame indexed by operation."""
+        rows = {op: entry.as_row() for op, entry in sorted(self._by_operation.items())}
+        frame = pd.DataFrame.from_dict(rows, orient="index", columns=STAT_COLUMNS)
+        frame.index.name = "operation"
+        return frame
@@ -0,0 +1,216 @@
+"""
+loadgen.py
+End-to-end load generator and soak test for the REPL.
+
+A WorkloadGenerator produces a realistic mix of arithmetic, `trig` plugin
+calls, history commands and malformed input. `run_soak` feeds that stream
+to `REPL.start` through a scripted stdin for a fixed number of input lines
+or a fixed duration, timing every command. The report gives ops/sec per
+time window, latency percentiles, peak RSS (the OS high-water mark, so
+short spikes between samples are not missed), and flags throughput decay
+(e.g. the slowdown caused by history growth).
+
+Usage:
+    python -m calculator.loadgen --lines 20000
+    python -m calculator.loadgen --duration 60 --seed 7
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+from calculator.memstats import current_rss_bytes, format_bytes, peak_rss_bytes
+from calculator.repl import REPL
+
+DEFAULT_MIX = {"arithmetic": 0.75, "trig": 0.1, "history": 0.05, "malformed": 0.1}
+
+BINARY_OPS = ["add", "sub", "mul", "div"]
+UNARY_OPS = ["sqrt", "square", "cube", "log"]
+TRIG_OPS = ["sin", "cos", "tan", "cot", "sec", "csc"]
+HISTORY_COMMANDS = ["history stats", "history stats", "history stats", "history"]
+MALFORMED_COMMANDS = ["add 1", "div 1 0", "sqrt -4", "mul two 3", "foobar 1 2", "log", "   "]
+
+class WorkloadGenerator:
+    """Produces commands, each as the list of input lines it needs."""
+    def __init__(self, mix=None, seed=None):
+        self.mix = mix or DEFAULT_MIX
+        self._rng = random.Random(seed)
+        self._kinds = list(self.mix)
+        self._weights = [self.mix[kind] for kind in self._kinds]
+
+    def next_command(self):
+        kind = self._rng.choices(self._kinds, self._weights)[0]
+        return getattr(self, f"_make_{kind}")()
+
+    def _make_arithmetic(self):
+        if self._rng.random() < 0.6:
+            op = self._rng.choice(BINARY_OPS)
+            a, b = self._rng.randint(-1000, 1000), self._rng.randint(1, 1000)
+            return [f"{op} {a} {b}"]
+        op = self._rng.choice(UNARY_OPS)
+        return [f"{op} {self._rng.randint(1, 10000)}"]
+
+    def _make_trig(self):
+        op = self._rng.choice(TRIG_OPS)
+        angle = self._rng.choice([0, 30, 45, 60, 90, 180, self._rng.randint(-720, 720)])
+        return ["trig", f"{op} {angle}"]
+
+    def _make_history(self):
+        return [self._rng.choice(HISTORY_COMMANDS)]
+
+    def _make_malformed(self):
+        return [self._rng.choice(MALFORMED_COMMANDS)]
+
+class _ScriptedStdin:
+    """
+    Stands in for sys.stdin. Each readline() that starts a new command closes
+    the timing of the previous one, so latency covers the whole dispatch,
+    including any follow-up lines a plugin reads.
+    """
+    def __init__(self, generator, max_lines=None, duration=None):
+        self.generator = generator
+        self.max_lines = max_lines
+        self.duration = duration
+        self.completions = []
+        self.latencies = []
+        self.peak_rss = current_rss_bytes() or 0
+        self.started = time.perf_counter()
+        self._lines_sent = 0
+        self._continuation = []
+        self._command_started = None
+
+    def _out_of_budget(self, now):
+        if self.max_lines is not None and self._lines_sent >= self.max_lines:
+            return True
+        return self.duration is not None and now - self.started >= self.duration
+
+    def readline(self):
+        now = time.perf_counter()
+        if self._continuation:
+            self._lines_sent += 1
+            return self._continuation.pop(0) + "\n"
+        if self._command_started is not None:
+            self.completions.append(now - self.started)
+            self.latencies.append(now - self._command_started)
+            self._command_started = None
+            if len(self.latencies) % 100 == 0:
+                self.peak_rss = max(self.peak_rss, current_rss_bytes() or 0)
+        if self._out_of_budget(now):
+            return "exit\n"
+        lines = self.generator.next_command()
+        self._continuation = lines[1:]
+        self._lines_sent += 1
+        self._command_started = time.perf_counter()
+        return lines[0] + "\n"
+
+class SoakReport:
+    """Throughput, latency and memory results of a soak run."""
+    def __init__(self, completions, latencies, peak_rss, window=1.0, decay_threshold=0.3):
+        self.completions = np.asarray(completions, dtype=float)
+        self.latencies = np.asarray(latencies, dtype=float)
+        self.peak_rss = peak_rss
+        self.window = window
+        self.decay_threshold = decay_threshold
+
+    @property
+    def commands(self):
+        return len(self.latencies)
+
+    @property
+    def elapsed(self):
+        return float(self.completions[-1]) if self.commands else 0.0
+
+    @property
+    def ops_per_second(self):
+        return self.commands / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentiles(self, points=(50, 90, 99)):
+        """Latency percentiles in seconds, keyed by percentile."""
+        if not self.commands:
+            return {p: 0.0 for p in points}
+        return dict(zip(points, np.percentile(self.latencies, points).tolist()))
+
+    def timeline(self):
+        """List of (window start in seconds, ops/sec in that window)."""
+        if not self.commands:
+            return []
+        buckets = np.bincount((self.completions // self.window).astype(int))
+        return [(i * self.window, count / self.window) for i, count in enumerate(buckets)]
+
+    def decay_ratio(self):
+        """
+        Median latency of the first tenth of commands divided by that of the
+        last tenth; 1.0 means steady throughput, lower means it decayed.
+        """
+        segment = max(1, self.commands // 10)
+        if self.commands < 2 * segment:
+            return 1.0
+        first = np.median(self.latencies[:segment])
+        last = np.median(self.latencies[-segment:])
+        return float(first / last) if last > 0 else 1.0
+
+    @property
+    def decayed(self):
+        return self.decay_ratio() < 1 - self.decay_threshold
+
+    def format(self):
+        pcts = self.percentiles()
+        lines = [
+            f"Commands: {self.commands} in {self.elapsed:.2f}s "
+            f"({self.ops_per_second:,.0f} ops/s)",
+            "Latency: " + ", ".join(f"p{p}={v * 1000:.3f}ms" for p, v in pcts.items()),
+            f"Peak RSS: {format_bytes(self.peak_rss)}",
+            "Throughput over time:",
+        ]
+        lines.extend(f"  {start:7.1f}s  {rate:10,.0f} ops/s" for start, rate in self.timeline())
+        verdict = "DECAY DETECTED" if self.decayed else "steady"
+        lines.append(f"Throughput ratio last/first: {self.decay_ratio():.2f} ({verdict})")
+        return "\n".join(lines)
+
+def run_soak(max_lines=None, duration=None, mix=None, seed=None, window=1.0):
+    """
+    Drive a fresh REPL (with an empty temporary history file) with generated
+    input until `max_lines` input lines or `duration` seconds are used up,
+    and return a SoakReport.
+    """
+    if max_lines is None and duration is None:
+        raise ValueError("Provide max_lines or duration.")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repl = REPL(history_file=os.path.join(tmp_dir, "history.csv"))
+        repl.calculator.history.wait_until_loaded()
+        stdin = _ScriptedStdin(WorkloadGenerator(mix, seed), max_lines, duration)
+        saved_stdin = sys.stdin
+        sys.stdin = stdin
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, \
+                    contextlib.redirect_stdout(devnull):
+                repl.start()
+        except SystemExit:
+            pass
+        finally:
+            sys.stdin = saved_stdin
+    # peak_rss_bytes() is the OS high-water mark; the periodic samples only
+    # cover platforms where it is unavailable.
+    stdin.peak_rss = max(stdin.peak_rss, current_rss_bytes() or 0, peak_rss_bytes() or 0)
+    return SoakReport(stdin.completions, stdin.latencies, stdin.peak_rss, window)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak test the calculator REPL.")
+    parser.add_argument("--lines", type=int, help="number of input lines to send")
+    parser.add_argument("--duration", type=float, help="seconds to run for")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--window", type=float, default=1.0,
+                        help="seconds per throughput window")
+    args = parser.parse_args(argv)
+    if args.lines is None and args.duration is None:
+        parser.error("one of --lines or --duration is required")
+    report = run_soak(args.lines, args.duration, seed=args.seed, window=args.window)
+    print(report.format())
+    return 1 if report.decayed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
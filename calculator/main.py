@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
 
@@ -6,13 +7,39 @@ if __name__ == "__main__" and __package__ is None:
     # Insert repository root (parent directory of "calculator") into sys.path.
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     # Re-run this module as a package.
-    os.execvp(sys.executable, [sys.executable, "-m", "calculator.main"])
+    os.execvp(sys.executable, [sys.executable, "-m", "calculator.main", *sys.argv[1:]])
 
 # pylint: disable=wrong-import-position
+from calculator.async_repl import AsyncREPL
+from calculator.calibration import Calibration
+from calculator.follow import FollowIngestor
+from calculator.main_logic import CommandFactory
 from calculator.repl import REPL
 
-def main():
-    repl = REPL()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Advanced Python Calculator REPL.")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="run long commands as background jobs ('<command> &')")
+    parser.add_argument("--follow", metavar="FILE",
+                        help="tail FILE and process operation lines as they are appended")
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="where --follow stores its offset (default: FILE.checkpoint)")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="re-run the scalar/vector dispatch benchmark and print the thresholds")
+    args = parser.parse_args(argv)
+    if args.calibrate:
+        CommandFactory.calibration = Calibration.load_or_run(CommandFactory.operation_map,
+                                                             force=True)
+        print(CommandFactory.calibration.format())
+        return
+    if args.follow:
+        ingestor = FollowIngestor(args.follow, REPL(), checkpoint_path=args.checkpoint)
+        try:
+            ingestor.run()
+        except KeyboardInterrupt:
+            print(f"Stopped following {args.follow} at byte {ingestor.offset}.")
+        return
+    repl = AsyncREPL() if args.use_async else REPL()
     repl.start()
 
 if __name__ == "__main__":
@@ -10,6 +10,10 @@ Design Patterns:
 - Singleton Pattern: LoggerSingleton provides a global logger.
 """
 
+import os
+import threading
+import numpy as np
+from calculator.calibration import Calibration
 from calculator.commands import (
     AddCommand, SubCommand, MulCommand, DivCommand,
     SqrtCommand, SquareCommand, CubeCommand, LogCommand
@@ -20,7 +24,11 @@ from calculator.logger import LoggerSingleton
 LOGGER = LoggerSingleton.get_logger()
 
 class CommandFactory:
-    """Factory to create operation command objects."""
+    """
+    Factory to create operation command objects.
+    `execute_many` runs a command over arrays, choosing the scalar or the
+    vectorized path from this host's calibration (see calibration.py).
+    """
     operation_map = {
         "add": AddCommand(),
         "sub": SubCommand(),
@@ -31,6 +39,13 @@ class CommandFactory:
         "cube": CubeCommand(),
         "log": LogCommand()
     }
+    # Number of operands each operation takes (unary commands ignore their second operand).
+    operation_arity = {
+        "add": 2, "sub": 2, "mul": 2, "div": 2,
+        "sqrt": 1, "square": 1, "cube": 1, "log": 1,
+    }
+    calibration = None
+    _calibration_lock = threading.Lock()
 
     @staticmethod
     def get_command(operation: str):
@@ -39,15 +54,45 @@ class CommandFactory:
             LOGGER.error("Unknown operation requested: %s", operation)
         return cmd_obj
 
+    @classmethod
+    def get_calibration(cls):
+        """Load (or on first use on this host, measure) the dispatch thresholds."""
+        if cls.calibration is None:
+            # Only one thread benchmarks; concurrent runs would skew each other's timings.
+            with cls._calibration_lock:
+                if cls.calibration is None:
+                    cls.calibration = Calibration.load_or_run(cls.operation_map)
+        return cls.calibration
+
+    @classmethod
+    def execute_many(cls, operation, a, b):
+        """
+        Apply `operation` element-wise to arrays `a` and `b` and return a float
+        array (NaN where the scalar command would raise), or None if the
+        operation is unknown.
+        """
+        cmd_obj = cls.get_command(operation)
+        if not cmd_obj:
+            return None
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        if cls.get_calibration().use_vector(operation, len(a)):
+            return cmd_obj.execute_batch(a, b)
+        return cmd_obj.execute_scalar_batch(a, b)
+
 class CalculatorApp:
     """
     Main Calculator application class.
     Uses CommandFactory to execute the proper command and manages history 
-    via HistoryFacade.
+    via HistoryFacade. History is loaded in the background so the caller
+    can start accepting input straight away. Setting HISTORY_COMPACT=1
+    stores repeated operations once (see compact_history.py).
     """
-    def __init__(self, history_file="history/history.csv"):
-        self.history = HistoryFacade(filename=history_file)
-        self.history.load_history()
+    def __init__(self, history_file="history/history.csv", compact_history=None):
+        if compact_history is None:
+            compact_history = os.environ.get("HISTORY_COMPACT", "").lower() in ("1", "true", "yes")
+        self.history = HistoryFacade(filename=history_file, compact=compact_history)
+        self.history.load_history_async()
 
     def perform_operation(self, operation, a, b):
         LOGGER.info("Performing operation: %s with arguments %s and %s",
@@ -60,6 +105,7 @@ class CalculatorApp:
             result = cmd.execute(a, b)
         except Exception as exc:  # pylint: disable=broad-exception-caught
             LOGGER.error("Error during execution of %s: %s", operation, exc)
+            self.history.record_error(operation)
             raise exc
         LOGGER.info("Operation result: %s", result)
         self.history.add_record(operation, a, b, result)
@@ -0,0 +1,154 @@
+"""
+memstats.py
+Memory accounting for the calculator process: current/peak RSS, the
+history store's footprint, cache sizes, and an opt-in tracemalloc
+allocation tracer.
+
+psutil is used for RSS when installed; otherwise /proc/self/statm is read
+(Linux only). Peak RSS comes from the `resource` module where available.
+"""
+
+import os
+import sys
+import tracemalloc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+def current_rss_bytes():
+    """Current resident set size in bytes, or None if it cannot be determined."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def peak_rss_bytes():
+    """Peak resident set size in bytes, or None if it cannot be determined."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def format_bytes(num_bytes):
+    """Format a byte count for display (e.g. '12.3 MB')."""
+    if num_bytes is None:
+        return "n/a"
+    value = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if abs(value) < 1024:
+            return f"{int(value)} B" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+def cache_stats(history=None):
+    """
+    Sizes of the process's caches: the LRU cache of every loaded plugin that
+    exposes `cache_info()` (e.g. trig), plus the history's own caches.
+    """
+    caches = {}
+    for name, module in sorted(sys.modules.items()):
+        cache_info = getattr(module, "cache_info", None)
+        if name.startswith("calculator.plugins.") and callable(cache_info):
+            info = cache_info()
+            caches[name.rsplit(".", 1)[1]] = {
+                "entries": info.currsize, "max_entries": info.maxsize,
+                "hits": info.hits, "misses": info.misses,
+            }
+    if history is not None:
+        caches.update(history.cache_usage())
+    return caches
+
+def collect(history=None):
+    """
+    Gather memory statistics as a dict. If a HistoryFacade is given, its
+    `memory_usage()` report is included under the "history" key. Cache
+    sizes are under "caches".
+    """
+    stats = {
+        "rss": current_rss_bytes(),
+        "peak_rss": peak_rss_bytes(),
+        "tracing": tracemalloc.is_tracing(),
+        "caches": cache_stats(history),
+    }
+    if history is not None:
+        stats["history"] = history.memory_usage()
+    return stats
+
+def _format_entry(key, value):
+    return f"{key.replace('_', ' ')} {format_bytes(value) if key.endswith('bytes') else value}"
+
+def format_stats(stats):
+    """Render a dict from `collect()` for the REPL."""
+    lines = [
+        f"Current RSS: {format_bytes(stats['rss'])}",
+        f"Peak RSS: {format_bytes(stats['peak_rss'])}",
+    ]
+    for key, value in stats.get("history", {}).items():
+        label = key.replace("_", " ")
+        shown = format_bytes(value) if key.endswith("bytes") else value
+        lines.append(f"History {label}: {shown}")
+    for name, info in stats.get("caches", {}).items():
+        details = ", ".join(_format_entry(key, value) for key, value in info.items())
+        lines.append(f"Cache {name}: {details}")
+    lines.append(f"Allocation tracing: {'on' if stats['tracing'] else 'off'}")
+    return "\n".join(lines)
+
+class AllocationTracer:
+    """
+    Opt-in wrapper around tracemalloc. `start()` begins tracing, `snapshot()`
+    records a baseline, `top()` lists the largest allocation sites and
+    `diff()` shows growth since the baseline.
+    """
+    def __init__(self, frames=1):
+        self.frames = frames
+        self._baseline = None
+
+    @property
+    def is_tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._baseline = None
+
+    def stop(self):
+        tracemalloc.stop()
+        self._baseline = None
+
+    def snapshot(self):
+        """Take and keep a baseline snapshot for later `diff()` calls."""
+        self._require_tracing()
+        self._baseline = tracemalloc.take_snapshot()
+        return self._baseline
+
+    def top(self, limit=10):
+        """Return the `limit` largest allocation sites as formatted lines."""
+        self._require_tracing()
+        stats = tracemalloc.take_snapshot().statistics("lineno")
+        return [str(stat) for stat in stats[:limit]]
+
+    def diff(self, limit=10):
+        """Return the `limit` biggest changes since the baseline snapshot."""
+        self._require_tracing()
+        if self._baseline is None:
+            raise RuntimeError("No baseline snapshot; call snapshot() first.")
+        current = tracemalloc.take_snapshot()
+        stats = current.compare_to(self._baseline, "lineno")
+        return [str(stat) for stat in stats[:limit]]
+
+    def _require_tracing(self):
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Allocation tracing is off; call start() first.")
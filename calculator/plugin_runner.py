@@ -0,0 +1,167 @@
+"""
+plugin_runner.py
+Runs plugins in isolated worker processes.
+
+A PluginProcessPool keeps a few warm worker processes. Each call ships the
+plugin's module/class name and its input lines to a worker, which runs
+`execute()` with stdout captured and `input()` fed from those lines, then
+sends the output back. Calls that exceed the timeout kill the worker, and
+workers are recycled after `max_calls` calls or once their peak RSS passes
+`max_rss_mb`, so a hung or leaking plugin cannot take the REPL with it.
+"""
+
+import builtins
+import contextlib
+import importlib
+import io
+import multiprocessing
+import queue
+from calculator.exceptions import PluginExecutionError, PluginTimeoutError
+from calculator.logger import LoggerSingleton
+from calculator.memstats import peak_rss_bytes
+
+LOGGER = LoggerSingleton.get_logger()
+
+def _peak_rss_mb():
+    """Peak resident set size of the current process in MB (0 if unknown)."""
+    return (peak_rss_bytes() or 0) / (1024 * 1024)
+
+def _worker_main(conn):
+    """Worker loop: receive (module, class, input lines), run the plugin, reply."""
+    plugins = {}
+    pending_input = []
+
+    def fed_input(_prompt=""):
+        if not pending_input:
+            raise EOFError("Plugin requested more input than was supplied.")
+        return pending_input.pop(0)
+
+    builtins.input = fed_input
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        module_name, class_name, input_lines = request
+        pending_input[:] = list(input_lines)
+        output = io.StringIO()
+        try:
+            key = (module_name, class_name)
+            if key not in plugins:
+                plugins[key] = getattr(importlib.import_module(module_name), class_name)()
+            with contextlib.redirect_stdout(output):
+                plugins[key].execute()
+            conn.send(("ok", output.getvalue(), _peak_rss_mb()))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            conn.send(("error", f"{type(exc).__name__}: {exc}", _peak_rss_mb()))
+
+class _PluginWorker:
+    """Parent-side handle on one worker process."""
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+
+    def call(self, request, timeout):
+        try:
+            self.conn.send(request)
+            if not self.conn.poll(timeout):
+                raise PluginTimeoutError(f"Plugin did not finish within {timeout} seconds.")
+            return self.conn.recv()
+        except (OSError, EOFError) as exc:
+            raise PluginExecutionError("Plugin worker exited unexpectedly.") from exc
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            with contextlib.suppress(OSError, BrokenPipeError):
+                self.conn.send(None)
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class PluginProcessPool:
+    """
+    A warm pool of worker processes for running untrusted plugins.
+    Workers are started with the 'spawn' method so they do not inherit the
+    REPL's memory (history DataFrame, loaded modules) or its threads.
+    """
+    def __init__(self, size=1, timeout=5.0, max_calls=100, max_rss_mb=512):
+        self.size = size
+        self.timeout = timeout
+        self.max_calls = max_calls
+        self.max_rss_mb = max_rss_mb
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._started = False
+
+    def start(self):
+        """Start the worker processes (called lazily on first use)."""
+        if not self._started:
+            for _ in range(self.size):
+                self._idle.put(_PluginWorker(self._context))
+            self._started = True
+
+    def execute(self, module_name, input_lines=(), class_name="PluginCommand"):
+        """
+        Run `class_name` from `module_name` in a worker and return its output.
+        Raises PluginTimeoutError or PluginExecutionError on failure.
+        """
+        self.start()
+        worker = self._idle.get()
+        replied = False
+        try:
+            if not worker.process.is_alive():
+                LOGGER.warning("Plugin worker %s is not running; replacing it.",
+                               worker.process.pid)
+                worker.stop(kill=True)
+                worker = _PluginWorker(self._context)
+            status, payload, rss_mb = worker.call(
+                (module_name, class_name, list(input_lines)), self.timeout
+            )
+            replied = True
+            worker.calls += 1
+            if worker.calls >= self.max_calls or (self.max_rss_mb and rss_mb > self.max_rss_mb):
+                LOGGER.info("Recycling plugin worker %s after %d calls (peak RSS %.1f MB).",
+                            worker.process.pid, worker.calls, rss_mb)
+                worker.stop()
+                worker = _PluginWorker(self._context)
+        except (PluginTimeoutError, PluginExecutionError):
+            LOGGER.error("Plugin %s.%s failed in worker %s; restarting worker.",
+                         module_name, class_name, worker.process.pid)
+            raise
+        finally:
+            if not replied:
+                # No reply was received (timeout, dead pipe, or an interrupt such as
+                # Ctrl-C), so the worker may still be running the call: never reuse it.
+                worker = self._replace(worker)
+            self._idle.put(worker)
+        if status == "error":
+            raise PluginExecutionError(payload)
+        return payload
+
+    def _replace(self, worker):
+        """Kill `worker` and return a new one (or the dead one, replaced on its next use)."""
+        worker.stop(kill=True)
+        try:
+            return _PluginWorker(self._context)
+        except OSError as exc:
+            LOGGER.error("Could not start a plugin worker: %s", exc)
+            return worker
+
+    def shutdown(self):
+        """Stop all idle workers."""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+        self._started = False
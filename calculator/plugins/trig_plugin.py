@@ -3,15 +3,106 @@ trig_plugin.py
 A plugin that implements trigonometric functions.
 Users can enter a command such as "trig" in the REPL, then
 input an operation (e.g., sin, cos, tan, cot, sec, csc) and an angle in degrees.
+
+Angles are reduced modulo 360 in the degree domain first. Multiples of 30
+and 45 degrees are answered from a table of exact values, which also marks
+exactly where cot/sec/csc/tan are undefined. Other angles go through
+`math`. Results are kept in a bounded LRU cache keyed on the raw
+(operation, angle) input, so a repeated query is a single lookup.
 """
 
 import math
+from functools import lru_cache
 from calculator.logger import LoggerSingleton
 
 LOGGER = LoggerSingleton.get_logger()
 
-# Disable too-many-branches since it's a single function with multiple ops.
-# pylint: disable=too-many-branches
+OPERATIONS = ("sin", "cos", "tan", "cot", "sec", "csc")
+
+FUNCTION_NAMES = {
+    "sin": "Sine", "cos": "Cosine", "tan": "Tangent",
+    "cot": "Cotangent", "sec": "Secant", "csc": "Cosecant",
+}
+
+_SQRT2 = math.sqrt(2)
+_SQRT3 = math.sqrt(3)
+
+# Exact (sin, cos, tan, cot, sec, csc) for first-quadrant reference angles.
+# None marks an undefined value.
+_FIRST_QUADRANT = {
+    0: (0.0, 1.0, 0.0, None, 1.0, None),
+    30: (0.5, _SQRT3 / 2, _SQRT3 / 3, _SQRT3, 2 * _SQRT3 / 3, 2.0),
+    45: (_SQRT2 / 2, _SQRT2 / 2, 1.0, 1.0, _SQRT2, _SQRT2),
+    60: (_SQRT3 / 2, 0.5, _SQRT3, _SQRT3 / 3, 2.0, 2 * _SQRT3 / 3),
+    90: (1.0, 0.0, None, 0.0, None, 1.0),
+}
+
+def _build_exact_table():
+    """Extend the first-quadrant values to every multiple of 30 or 45 in [0, 360)."""
+    table = {}
+    for angle in sorted(set(range(0, 360, 30)) | set(range(0, 360, 45))):
+        if angle <= 90:
+            reference, sin_sign, cos_sign = angle, 1, 1
+        elif angle <= 180:
+            reference, sin_sign, cos_sign = 180 - angle, 1, -1
+        elif angle <= 270:
+            reference, sin_sign, cos_sign = angle - 180, -1, -1
+        else:
+            reference, sin_sign, cos_sign = 360 - angle, -1, 1
+        signs = (sin_sign, cos_sign, sin_sign * cos_sign,
+                 sin_sign * cos_sign, cos_sign, sin_sign)
+        # Adding 0.0 turns -0.0 into 0.0.
+        table[angle] = {
+            op: None if value is None else sign * value + 0.0
+            for op, value, sign in zip(OPERATIONS, _FIRST_QUADRANT[reference], signs)
+        }
+    return table
+
+EXACT_VALUES = _build_exact_table()
+
+def reduce_angle(angle_deg):
+    """Reduce an angle in degrees to the range [0, 360)."""
+    reduced = math.fmod(angle_deg, 360.0)
+    if reduced < 0:
+        reduced += 360.0
+    # Adding 360 to a tiny negative remainder can round up to 360 itself.
+    return 0.0 if reduced >= 360.0 else reduced
+
+def _compute(operation, reduced_deg):
+    angle_rad = math.radians(reduced_deg)
+    if operation == "sin":
+        return math.sin(angle_rad)
+    if operation == "cos":
+        return math.cos(angle_rad)
+    if operation == "tan":
+        return math.tan(angle_rad)
+    if operation == "cot":
+        return 1 / math.tan(angle_rad)
+    if operation == "sec":
+        return 1 / math.cos(angle_rad)
+    return 1 / math.sin(angle_rad)
+
+@lru_cache(maxsize=1024)
+def trig_value(operation, angle_deg):
+    """
+    Return the value of `operation` (one of OPERATIONS) at `angle_deg` degrees,
+    or None where the function is undefined.
+    """
+    reduced = reduce_angle(angle_deg)
+    exact = EXACT_VALUES.get(reduced)
+    if exact is not None:
+        return exact[operation]
+    # Undefined points are all multiples of 90, so they are in the table;
+    # every angle that reaches _compute has a finite, defined value.
+    return _compute(operation, reduced)
+
+def cache_info():
+    """Hit/miss statistics of the trig_value cache."""
+    return trig_value.cache_info()  # pylint: disable=no-value-for-parameter
+
+def clear_cache():
+    """Empty the trig_value cache."""
+    trig_value.cache_clear()
 
 class PluginCommand:
     """
@@ -19,8 +110,6 @@ class PluginCommand:
     sin, cos, tan, cot, sec, csc.
     The REPL loads plugins by looking for a class named 'PluginCommand'.
     """
-    TOLERANCE = 1e-10
-
     def __init__(self):
         self.command_name = "trig"
 
@@ -40,37 +129,15 @@ class PluginCommand:
                 return
             operation, angle_str = parts[0].lower(), parts[1]
             angle_deg = float(angle_str)
-            angle_rad = math.radians(angle_deg)
-            result = None
-
-            if operation == "sin":
-                result = math.sin(angle_rad)
-            elif operation == "cos":
-                result = math.cos(angle_rad)
-            elif operation == "tan":
-                result = math.tan(angle_rad)
-            elif operation == "cot":
-                tan_val = math.tan(angle_rad)
-                if abs(tan_val) < self.TOLERANCE:
-                    print("Cotangent is undefined for this angle.")
-                    return
-                result = 1 / tan_val
-            elif operation == "sec":
-                cos_val = math.cos(angle_rad)
-                if abs(cos_val) < self.TOLERANCE:
-                    print("Secant is undefined for this angle.")
-                    return
-                result = 1 / cos_val
-            elif operation == "csc":
-                sin_val = math.sin(angle_rad)
-                if abs(sin_val) < self.TOLERANCE:
-                    print("Cosecant is undefined for this angle.")
-                    return
-                result = 1 / sin_val
-            else:
+            if operation not in OPERATIONS:
                 print(f"Operation '{operation}' is not supported.")
                 return
 
+            result = trig_value(operation, angle_deg)
+            if result is None:
+                print(f"{FUNCTION_NAMES[operation]} is undefined for this angle.")
+                return
+
             LOGGER.info("Trig operation: %s, angle: %s degrees, result: %s",
                         operation, angle_deg, result)
             # Format the angle: if it is an integer, print without decimals.
@@ -7,16 +7,29 @@ Design Patterns: Command and Plugin.
 
 import sys
 import os
+import time
 import importlib
-from calculator.main_logic import CalculatorApp
+from calculator.exceptions import CalculatorError
+from calculator.main_logic import CalculatorApp, CommandFactory
+from calculator.memstats import AllocationTracer, collect, format_stats
+from calculator.plugin_runner import PluginProcessPool
+from calculator.replay import HistoryReplayer
+from calculator.variables import VariableCommands
 from calculator.logger import LoggerSingleton
 
 LOGGER = LoggerSingleton.get_logger()
 
 class REPL:
-    def __init__(self):
-        self.calculator = CalculatorApp()
+    def __init__(self, history_file="history/history.csv"):
+        self._started_at = time.perf_counter()
+        self.calculator = CalculatorApp(history_file=history_file)
         self.plugins = {}
+        # Plugins listed in ISOLATED_PLUGINS (comma-separated, or "all"), or
+        # declaring `isolated = True`, run in worker processes; others in-process.
+        self.isolated_plugins = set()
+        self.plugin_pool = None
+        self.tracer = AllocationTracer()
+        self.variables = VariableCommands()
         self.special_commands = {
             "exit": self.cmd_exit,
             "menu": self.cmd_menu,
@@ -26,18 +39,13 @@ class REPL:
             "delete_history_file": self.cmd_delete_history_file,
             "save_history": self.cmd_save_history,
             "load_history": self.cmd_load_history,
+            "replay": self.cmd_replay,
+            "memstats": self.cmd_memstats,
+            "let": self.variables.cmd_let,
+            "vars": self.variables.cmd_vars,
         }
         self.load_plugins()
-        self.arithmetic_cmds = {
-            "add": 2,
-            "sub": 2,
-            "mul": 2,
-            "div": 2,
-            "sqrt": 1,
-            "square": 1,
-            "cube": 1,
-            "log": 1,
-        }
+        self.arithmetic_cmds = dict(CommandFactory.operation_arity)
 
     def load_plugins(self):
         plugins_dir = os.path.join(os.path.dirname(__file__), "plugins")
@@ -56,16 +64,23 @@ class REPL:
                     if plugin_class:
                         instance = plugin_class()
                         self.plugins[instance.command_name] = instance
+                        if getattr(instance, "isolated", False):
+                            self.isolated_plugins.add(instance.command_name)
                         LOGGER.info("Plugin loaded: %s", instance.command_name)
                 except Exception as exc:  # pylint: disable=broad-exception-caught
                     LOGGER.error(
                         "Failed to load plugin %s: %s", plugin_name, exc,
                         exc_info=True
                     )
+        isolated_env = os.environ.get("ISOLATED_PLUGINS", "")
+        names = {name.strip().lower() for name in isolated_env.split(",") if name.strip()}
+        self.isolated_plugins |= set(self.plugins) if "all" in names else names
 
     # Special command handlers
     def cmd_exit(self, _parts):
         print("Exiting the calculator. Goodbye!")
+        if self.plugin_pool is not None:
+            self.plugin_pool.shutdown()
         sys.exit(0)
 
     def cmd_menu(self, _parts):
@@ -74,25 +89,82 @@ class REPL:
     def cmd_usage(self, _parts):
         self.show_usage()
 
-    def cmd_history(self, _parts):
+    def wait_for_history(self):
+        """Report progress and block if history is still loading in the background."""
+        history = self.calculator.history
+        if history.is_loading:
+            print(f"History is still loading ({history.load_progress()} rows so far), "
+                  "please wait...")
+            history.wait_until_loaded()
+
+    def cmd_history(self, parts):
+        self.wait_for_history()
+        if len(parts) > 1 and parts[1].lower() == "stats":
+            print(self.calculator.history.get_stats())
+            return
         print(self.calculator.history.get_history())
 
     def cmd_clear_history(self, _parts):
+        self.wait_for_history()
         self.calculator.history.clear_history()
         print("History cleared in memory.")
 
     def cmd_delete_history_file(self, _parts):
+        self.wait_for_history()
         self.calculator.history.delete_history_file()
         print("History file deleted.")
 
     def cmd_save_history(self, _parts):
+        self.wait_for_history()
         self.calculator.history.save_history()
         print("History saved to file.")
 
     def cmd_load_history(self, _parts):
+        self.wait_for_history()
         self.calculator.history.load_history()
         print("History loaded from file.")
 
+    def cmd_replay(self, parts):
+        tolerance = 1e-9
+        if len(parts) > 1:
+            try:
+                tolerance = float(parts[1])
+            except ValueError:
+                print("Error: tolerance must be numeric (e.g. 'replay 1e-6').")
+                return
+        self.wait_for_history()
+        report = HistoryReplayer(tolerance=tolerance).replay(
+            self.calculator.history.get_history()
+        )
+        print(report.format())
+
+    def cmd_memstats(self, parts):
+        if len(parts) < 2:
+            print(format_stats(collect(self.calculator.history)))
+            return
+        if parts[1].lower() != "trace" or len(parts) < 3:
+            print("Usage: memstats [trace start|snapshot|top|diff|stop]")
+            return
+        action = parts[2].lower()
+        try:
+            if action == "start":
+                self.tracer.start()
+                print("Allocation tracing started.")
+            elif action == "stop":
+                self.tracer.stop()
+                print("Allocation tracing stopped.")
+            elif action == "snapshot":
+                self.tracer.snapshot()
+                print("Baseline snapshot taken.")
+            elif action == "top":
+                print("\n".join(self.tracer.top()))
+            elif action == "diff":
+                print("\n".join(self.tracer.diff()))
+            else:
+                print("Usage: memstats [trace start|snapshot|top|diff|stop]")
+        except RuntimeError as exc:
+            print(f"Error: {exc}")
+
     # Display methods
     def show_menu(self):
         print("\n--- MENU: Available Calculator Commands ---")
@@ -105,8 +177,8 @@ class REPL:
             for cmd_name in self.plugins:
                 print("  " + cmd_name)
         print("\nSpecial Commands:")
-        print("  history, clear_history, delete_history_file")
-        print("  save_history, load_history, menu, usage, exit\n")
+        print("  history, history stats, clear_history, delete_history_file")
+        print("  save_history, load_history, replay, memstats, let, vars, menu, usage, exit\n")
 
     def show_usage(self):
         print("\n--- USAGE: How to Use the Calculator ---")
@@ -115,25 +187,39 @@ class REPL:
         print("2) For single-operand commands (sqrt, square, cube, log):")
         print("      Example: 'sqrt 16'")
         print("3) For special commands: 'menu', 'usage', 'exit'.")
-        print("4) For plugin commands, type the command name (e.g. 'sample_plugin').\n")
+        print("4) For plugin commands, type the command name (e.g. 'sample_plugin').")
+        print("   Isolated plugins take their input on the same line (e.g. 'trig sin 30').")
+        print("5) To re-run history and check results still match: 'replay [tolerance]'.")
+        print("6) For memory use: 'memstats', or 'memstats trace start|snapshot|top|diff|stop'.")
+        print("7) For variables: 'let x = add 2 3', 'let y = sqrt x', then 'vars'.")
+        print("   Changing x recomputes only the variables that depend on it.\n")
 
-    def start(self):
+    def _show_welcome(self):
         print("Welcome to the Advanced Calculator REPL!")
         print("Type 'menu' to see available commands, 'usage' for instructions, "
               "or 'exit' to quit.\n")
+        LOGGER.info("Prompt ready %.3fs after startup",
+                    time.perf_counter() - self._started_at)
+
+    def start(self):
+        self._show_welcome()
         while True:
             user_input = input(">> ").strip()
             if not user_input:
                 continue
-            parts = user_input.split()
-            cmd = parts[0].lower()
-            if self.handle_special_command(cmd, parts):
-                continue
-            if self.handle_plugin_command(cmd):
-                continue
-            if self.handle_arithmetic_command(cmd, parts):
-                continue
-            print(f"Unknown command: {cmd}. Type 'menu' to see available commands.")
+            self.dispatch(user_input)
+
+    def dispatch(self, user_input):
+        """Run one non-empty line of input."""
+        parts = user_input.split()
+        cmd = parts[0].lower()
+        if self.handle_special_command(cmd, parts):
+            return
+        if self.handle_plugin_command(cmd, parts):
+            return
+        if self.handle_arithmetic_command(cmd, parts):
+            return
+        print(f"Unknown command: {cmd}. Type 'menu' to see available commands.")
 
     def handle_special_command(self, cmd, parts):
         if cmd in self.special_commands:
@@ -141,12 +227,30 @@ class REPL:
             return True
         return False
 
-    def handle_plugin_command(self, cmd):
+    def handle_plugin_command(self, cmd, parts=None):
         if cmd in self.plugins:
-            self.plugins[cmd].execute()
+            if cmd in self.isolated_plugins:
+                self.run_isolated_plugin(cmd, parts or [cmd])
+            else:
+                self.plugins[cmd].execute()
             return True
         return False
 
+    def run_isolated_plugin(self, cmd, parts):
+        """Run a plugin in a worker process, feeding it the rest of the line as input."""
+        if self.plugin_pool is None:
+            timeout = float(os.environ.get("PLUGIN_TIMEOUT", "5"))
+            self.plugin_pool = PluginProcessPool(timeout=timeout)
+        plugin_class = type(self.plugins[cmd])
+        input_lines = [" ".join(parts[1:])] if len(parts) > 1 else []
+        try:
+            output = self.plugin_pool.execute(
+                plugin_class.__module__, input_lines, plugin_class.__name__
+            )
+            print(output, end="")
+        except CalculatorError as exc:
+            print(f"Plugin error: {exc}")
+
     def handle_arithmetic_command(self, cmd, parts):
         if cmd in self.arithmetic_cmds:
             required_args = self.arithmetic_cmds[cmd]
@@ -0,0 +1,147 @@
+"""
+replay.py
+Re-executes recorded history to verify that old results still reproduce.
+
+Rows are grouped by operation and each group is run through
+`CommandFactory.execute_many` (scalar or vectorized, by group size).
+Large groups are split into chunks so a single dominant operation still
+spreads across the worker pool. NumPy
+releases the GIL inside its kernels, so a thread pool is sufficient.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from calculator.main_logic import CommandFactory
+from calculator.logger import LoggerSingleton
+
+LOGGER = LoggerSingleton.get_logger()
+
+class ReplayReport:
+    """Outcome of a replay run: per-operation summary plus mismatching rows."""
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+        self.summary = {}
+        self.mismatches = []
+        self.total_rows = 0
+        self.elapsed = 0.0
+
+    @property
+    def mismatch_count(self):
+        return len(self.mismatches)
+
+    @property
+    def rows_per_second(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.total_rows / self.elapsed
+
+    def add_chunk(self, operation, stats, mismatches):
+        """Merge the result of one replayed chunk into the report."""
+        entry = self.summary.setdefault(operation, {
+            "rows": 0, "mismatches": 0, "max_abs_error": 0.0,
+            "seconds": 0.0, "known": stats["known"],
+        })
+        entry["rows"] += stats["rows"]
+        entry["mismatches"] += len(mismatches)
+        entry["max_abs_error"] = max(entry["max_abs_error"], stats["max_abs_error"])
+        entry["seconds"] += stats["seconds"]
+        self.mismatches.extend(mismatches)
+        self.total_rows += stats["rows"]
+
+    def format(self, max_mismatches=10):
+        """Return a human readable summary of the replay."""
+        lines = [
+            f"Replayed {self.total_rows} rows in {self.elapsed:.3f}s "
+            f"({self.rows_per_second:,.0f} rows/s), tolerance {self.tolerance:g}."
+        ]
+        for operation in sorted(self.summary):
+            entry = self.summary[operation]
+            note = "" if entry["known"] else " (unknown operation)"
+            lines.append(
+                f"  {operation}: {entry['rows']} rows, {entry['mismatches']} mismatches, "
+                f"max abs error {entry['max_abs_error']:g}{note}"
+            )
+        if self.mismatches:
+            lines.append(f"Mismatches ({self.mismatch_count} total):")
+            for item in sorted(self.mismatches, key=lambda m: m["row_id"])[:max_mismatches]:
+                lines.append(
+                    f"  row {item['row_id']}: {item['operation']} {item['operand1']} "
+                    f"{item['operand2']} recorded={item['recorded']} replayed={item['replayed']}"
+                )
+        else:
+            lines.append("All results reproduced.")
+        return "\n".join(lines)
+
+class HistoryReplayer:
+    """
+    Replays a history DataFrame (columns: operation, operand1, operand2, result)
+    against the current command implementations.
+    """
+    def __init__(self, tolerance=1e-9, max_workers=None, chunk_size=100_000):
+        self.tolerance = tolerance
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+
+    def replay(self, history_df):
+        """Replay every row of `history_df` and return a ReplayReport."""
+        report = ReplayReport(self.tolerance)
+        start = time.perf_counter()
+        tasks = list(self._split(history_df))
+        if tasks:
+            # Resolve the dispatch thresholds before the workers start competing for the CPU.
+            CommandFactory.get_calibration()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [pool.submit(self._replay_chunk, op, chunk) for op, chunk in tasks]
+                for (operation, _), future in zip(tasks, futures):
+                    stats, mismatches = future.result()
+                    report.add_chunk(operation, stats, mismatches)
+        report.elapsed = time.perf_counter() - start
+        LOGGER.info("Replay finished: %d rows, %d mismatches in %.3fs",
+                    report.total_rows, report.mismatch_count, report.elapsed)
+        return report
+
+    def _split(self, history_df):
+        """Yield (operation, chunk) pairs, one or more per operation group."""
+        if history_df.empty:
+            return
+        for operation, group in history_df.groupby("operation", sort=False):
+            for offset in range(0, len(group), self.chunk_size):
+                yield str(operation), group.iloc[offset:offset + self.chunk_size]
+
+    def _replay_chunk(self, operation, chunk):
+        started = time.perf_counter()
+        a = pd.to_numeric(chunk["operand1"], errors="coerce").to_numpy(dtype=float)
+        b = pd.to_numeric(chunk["operand2"], errors="coerce").to_numpy(dtype=float)
+        recorded = pd.to_numeric(chunk["result"], errors="coerce").to_numpy(dtype=float)
+        cmd = CommandFactory.operation_map.get(operation)
+        if cmd is None:
+            replayed = np.full(len(chunk), np.nan)
+        else:
+            replayed = CommandFactory.execute_many(operation, a, b)
+        bad = ~np.isclose(replayed, recorded, rtol=self.tolerance,
+                          atol=self.tolerance, equal_nan=True)
+        if cmd is None:
+            bad[:] = True
+        with np.errstate(invalid="ignore"):
+            errors = np.abs(replayed - recorded)
+        finite_errors = errors[np.isfinite(errors)]
+        stats = {
+            "rows": len(chunk),
+            "max_abs_error": float(finite_errors.max()) if finite_errors.size else 0.0,
+            "seconds": time.perf_counter() - started,
+            "known": cmd is not None,
+        }
+        mismatches = [
+            {
+                "row_id": row_id,
+                "operation": operation,
+                "operand1": a[i],
+                "operand2": b[i],
+                "recorded": recorded[i],
+                "replayed": replayed[i],
+            }
+            for i, row_id in zip(np.flatnonzero(bad), chunk.index[bad].tolist())
+        ]
+        return stats, mismatches
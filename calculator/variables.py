@@ -0,0 +1,210 @@
+"""
+variables.py
+Named variables with dependency tracking for the REPL's 'let' command.
+
+Each binding is either a literal, an alias of another variable, or a
+Command from CommandFactory applied to literals and/or other variables:
+
+    let x = add 2 3
+    let y = sqrt x
+
+Bindings form a dependency graph. Redefining a variable marks it and
+everything downstream of it dirty, and only that subgraph is recomputed,
+in topological order; every other value is reused. `define_many` applies
+several assignments and then does a single recompute pass.
+Values computed here are not added to the calculation history.
+"""
+
+from calculator.exceptions import CalculatorError
+from calculator.main_logic import CommandFactory
+
+def _is_number(token):
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+class Binding:
+    """One node of the graph: how to compute a variable and its current value."""
+    def __init__(self, name, operation, args):
+        self.name = name
+        self.operation = operation
+        self.command = CommandFactory.operation_map.get(operation) if operation else None
+        self.args = args
+        self.value = None
+        self.error = None
+
+    @property
+    def dependencies(self):
+        return list(dict.fromkeys(arg for arg in self.args if isinstance(arg, str)))
+
+    def describe(self):
+        if self.error is not None:
+            return f"{self.name} = Error: {self.error}"
+        return f"{self.name} = {self.value}"
+
+class VariableGraph:
+    """Holds the bindings and recomputes dirty nodes incrementally."""
+    def __init__(self):
+        self.bindings = {}
+        self._dependents = {}
+        self.last_recomputed = []
+
+    def __contains__(self, name):
+        return name in self.bindings
+
+    def get(self, name):
+        """
+        Return the value of `name`. Raises KeyError if it is undefined and
+        CalculatorError if its computation failed.
+        """
+        binding = self.bindings[name]
+        if binding.error is not None:
+            raise CalculatorError(binding.error)
+        return binding.value
+
+    def define(self, name, tokens):
+        """Bind `name` to an expression given as tokens, e.g. ['add', '2', 'x']."""
+        return self.define_many([(name, tokens)])
+
+    def define_many(self, assignments):
+        """
+        Apply several (name, tokens) assignments, then recompute every affected
+        variable once. Returns the names recomputed, in evaluation order.
+        Assignments are validated one by one; on an error, earlier ones stay applied.
+        """
+        changed = []
+        try:
+            for name, tokens in assignments:
+                self._bind(self._parse(name, tokens))
+                changed.append(name)
+        finally:
+            self._recompute(self._downstream(changed))
+        return self.last_recomputed
+
+    def _parse(self, name, tokens):
+        if not name.isidentifier():
+            raise ValueError(f"Invalid variable name: '{name}'.")
+        if _is_number(name):
+            # 'inf', 'nan', 'infinity' would always be read back as numbers.
+            raise ValueError(f"'{name}' is a number and cannot be a variable name.")
+        if name.lower() in CommandFactory.operation_map:
+            raise ValueError(f"'{name}' is an operation and cannot be a variable name.")
+        if not tokens:
+            raise ValueError(f"Missing expression for '{name}'.")
+        operation = tokens[0].lower()
+        if operation in CommandFactory.operation_map:
+            args = [self._parse_arg(token) for token in tokens[1:]]
+            arity = CommandFactory.operation_arity[operation]
+            if len(args) != arity:
+                raise ValueError(f"'{operation}' takes {arity} argument(s), got {len(args)}.")
+            if arity == 1:
+                args.append(0.0)
+            return Binding(name, operation, args)
+        if len(tokens) != 1:
+            raise ValueError(f"Unknown operation: '{tokens[0]}'.")
+        return Binding(name, None, [self._parse_arg(tokens[0])])
+
+    def _parse_arg(self, token):
+        try:
+            return float(token)
+        except ValueError:
+            pass
+        if not token.isidentifier():
+            raise ValueError(f"Invalid argument: '{token}'.")
+        if token not in self.bindings:
+            raise ValueError(f"Undefined variable: '{token}'.")
+        return token
+
+    def _bind(self, binding):
+        name = binding.name
+        if self._downstream([name]) & set(binding.dependencies):
+            raise ValueError(f"Circular dependency: '{name}' would depend on itself.")
+        old = self.bindings.get(name)
+        if old is not None:
+            for dep in old.dependencies:
+                self._dependents[dep].discard(name)
+        for dep in binding.dependencies:
+            self._dependents.setdefault(dep, set()).add(name)
+        self.bindings[name] = binding
+
+    def _downstream(self, names):
+        """`names` plus every variable that depends on them, directly or not."""
+        seen = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(self._dependents.get(name, ()))
+        return seen
+
+    def _recompute(self, dirty):
+        """Re-evaluate the dirty subgraph in topological order (Kahn's algorithm)."""
+        pending = {
+            name: sum(1 for dep in self.bindings[name].dependencies if dep in dirty)
+            for name in dirty if name in self.bindings
+        }
+        ready = sorted(name for name, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            self._evaluate(self.bindings[name])
+            for dependent in sorted(self._dependents.get(name, ())):
+                if dependent in pending:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        ready.append(dependent)
+        self.last_recomputed = order
+
+    def _evaluate(self, binding):
+        binding.value, binding.error = None, None
+        values = []
+        for arg in binding.args:
+            if isinstance(arg, str):
+                source = self.bindings[arg]
+                if source.error is not None:
+                    binding.error = f"depends on '{arg}', which failed"
+                    return
+                values.append(source.value)
+            else:
+                values.append(arg)
+        if binding.command is None:
+            binding.value = values[0]
+            return
+        try:
+            binding.value = binding.command.execute(values[0], values[1])
+        except (CalculatorError, ValueError, ArithmeticError) as exc:
+            binding.error = str(exc)
+
+    def describe(self, names=None):
+        """Return 'name = value' lines for `names` (default: all variables)."""
+        names = self.bindings if names is None else names
+        return [self.bindings[name].describe() for name in names]
+
+class VariableCommands:
+    """The REPL's 'let' and 'vars' commands, operating on a VariableGraph."""
+    def __init__(self, graph=None):
+        self.graph = graph or VariableGraph()
+
+    def cmd_let(self, parts):
+        assignments = []
+        for statement in " ".join(parts[1:]).split(";"):
+            name, equals, expression = statement.partition("=")
+            if not equals or not name.strip():
+                print("Usage: let <name> = <operation> <args> [; <name> = ...]")
+                return
+            assignments.append((name.strip(), expression.split()))
+        try:
+            recomputed = self.graph.define_many(assignments)
+        except ValueError as exc:
+            print(f"Error: {exc}")
+            recomputed = self.graph.last_recomputed
+        for line in self.graph.describe(recomputed):
+            print(line)
+
+    def cmd_vars(self, _parts):
+        lines = self.graph.describe()
+        print("\n".join(lines) if lines else "No variables defined.")
@@ -0,0 +1,12 @@
+"""
+conftest.py
+Shared fixtures: keep the scalar/vector calibration cache out of the home directory.
+"""
+
+import pytest
+from calculator.main_logic import CommandFactory
+
+@pytest.fixture(autouse=True)
+def isolated_calibration(monkeypatch, tmp_path):
+    monkeypatch.setenv("CALIBRATION_FILE", str(tmp_path / "calibration.json"))
+    monkeypatch.setattr(CommandFactory, "calibration", None)
@@ -0,0 +1,105 @@
+"""
+test_async_repl.py
+Tests for the asyncio REPL and its background jobs.
+"""
+
+# pylint: disable=redefined-outer-name
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from calculator.async_repl import AsyncREPL
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def async_repl(tmp_path):
+    repl_instance = AsyncREPL(history_file=str(tmp_path / "history.csv"))
+    repl_instance.calculator.history.wait_until_loaded()
+    return repl_instance
+
+def run_session(async_repl, monkeypatch, lines):
+    inputs = iter(lines)
+    monkeypatch.setattr("builtins.input", lambda _prompt="": next(inputs))
+    with pytest.raises(SystemExit):
+        async_repl.start()
+
+def test_background_save_and_wait(async_repl, monkeypatch, capsys, tmp_path):
+    run_session(async_repl, monkeypatch, [
+        "add 2 3", "save_history &", "wait 1", "jobs", "exit",
+    ])
+    out = capsys.readouterr().out
+    assert "Result: 5" in out
+    assert "[1] started: save_history" in out
+    assert "History saved to file." in out
+    assert "[1] done" in out
+    assert (tmp_path / "history.csv").exists()
+
+def test_history_jobs_run_in_submission_order(async_repl, monkeypatch, capsys):
+    release = threading.Event()
+    original_save = async_repl.calculator.history.save_history
+
+    def slow_save():
+        release.wait(5)
+        original_save()
+
+    monkeypatch.setattr(async_repl.calculator.history, "save_history", slow_save)
+    inputs = iter(["save_history &", "clear_history &", "jobs", "wait", "exit"])
+
+    def fake_input(_prompt=""):
+        line = next(inputs)
+        if line == "wait":
+            release.set()
+        return line
+
+    monkeypatch.setattr("builtins.input", fake_input)
+    async_repl.calculator.history.add_record("mul", 2, 3, 6)
+    with pytest.raises(SystemExit):
+        async_repl.start()
+    out = capsys.readouterr().out
+    assert "[1] running" in out
+    assert out.index("History saved to file.") < out.index("History cleared in memory.")
+    assert async_repl.calculator.history.get_history().empty
+
+def test_rejected_background_commands(async_repl, monkeypatch, capsys):
+    run_session(async_repl, monkeypatch, [
+        "trig &", "jobs &", "wait 7", "wait x", "jobs", "menu", "exit",
+    ])
+    out = capsys.readouterr().out
+    assert "run it in the foreground" in out
+    assert "'jobs' cannot run in the background." in out
+    assert "no job with id '7'" in out
+    assert "No background jobs." in out
+    assert "wait [id]" in out
+
+def test_eof_exits(async_repl, monkeypatch, capsys):
+    def eof(_prompt=""):
+        raise EOFError
+    monkeypatch.setattr("builtins.input", eof)
+    with pytest.raises(SystemExit):
+        async_repl.start()
+    assert "Goodbye!" in capsys.readouterr().out
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs POSIX signals")
+def test_ctrl_c_at_prompt_exits(tmp_path):
+    """SIGINT while the prompt waits for input ends the process straight away."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, LOG_FILE=str(tmp_path / "app.log"))
+    with subprocess.Popen(
+        [sys.executable, "-m", "calculator.main", "--async"], cwd=tmp_path, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    ) as process:
+        while "Welcome" not in process.stdout.readline():
+            pass
+        time.sleep(0.5)
+        process.send_signal(signal.SIGINT)
+        try:
+            out, _ = process.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            pytest.fail("async REPL did not exit after SIGINT")
+    assert "Interrupted. Goodbye!" in out
+    assert process.returncode == 130
@@ -0,0 +1,118 @@
+"""
+test_calibration.py
+Tests for the scalar/vector calibration and CommandFactory.execute_many.
+"""
+
+import itertools
+import json
+import math
+import threading
+import time
+import warnings
+import numpy as np
+import pytest
+from calculator.calibration import Calibration, cache_path, crossover, host_key
+from calculator.commands import AddCommand, Command
+from calculator.main_logic import CommandFactory
+
+class LoopOnlyCommand(Command):
+    """A command without a vectorized kernel."""
+    def execute(self, a, b):
+        return a - b
+
+EDGE_VALUES = [0.0, -0.0, 1.0, -1.0, 2.5, -4.0, 1e-308, 1e200, -1e200, 1e308,
+               math.inf, -math.inf, math.nan]
+
+@pytest.mark.parametrize("operation", sorted(CommandFactory.operation_map))
+def test_scalar_and_vector_paths_agree(operation):
+    """Both paths give the same result (NaN for errors) and the kernel raises no warnings."""
+    a, b = (np.array(values) for values in zip(*itertools.product(EDGE_VALUES, repeat=2)))
+    cmd = CommandFactory.operation_map[operation]
+    scalar = cmd.execute_scalar_batch(a, b)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        vector = cmd.execute_batch(a, b)
+    np.testing.assert_array_equal(scalar, vector)
+
+def test_cube_overflow_is_nan_on_both_paths():
+    cmd = CommandFactory.operation_map["cube"]
+    assert math.isnan(cmd.execute_scalar_batch([1e200], [0])[0])
+    assert math.isnan(cmd.execute_batch([1e200], [0])[0])
+    assert cmd.execute_batch([math.inf], [0])[0] == math.inf
+
+def test_scalar_path_accepts_lists_and_marks_errors():
+    results = CommandFactory.operation_map["div"].execute_scalar_batch([1, 4], [0, 2])
+    assert math.isnan(results[0])
+    assert results[1] == 2.0
+
+def test_crossover():
+    assert crossover(LoopOnlyCommand(), sizes=(1, 2), repeats=1) is None
+    assert crossover(AddCommand(), sizes=(1, 64, 1024, 4096), repeats=1) in (1, 64, 1024, None)
+
+def test_use_vector():
+    calibration = Calibration({"add": 8, "sqrt": None})
+    assert not calibration.use_vector("add", 7)
+    assert calibration.use_vector("add", 8)
+    assert not calibration.use_vector("sqrt", 10_000)
+    assert not calibration.use_vector("unknown", 10_000)
+
+def test_save_and_load_keeps_other_hosts(tmp_path):
+    path = str(tmp_path / "cache" / "calibration.json")
+    Calibration({"add": 4}, host="other-host").save(path)
+    Calibration({"add": 16}).save(path)
+    with open(path, encoding="utf-8") as cache:
+        entries = json.load(cache)
+    assert entries == {"other-host": {"add": 4}, host_key(): {"add": 16}}
+    assert Calibration.load(path).threshold("add") == 16
+
+def test_load_missing_or_corrupt(tmp_path):
+    path = tmp_path / "calibration.json"
+    assert Calibration.load(str(path)) is None
+    path.write_text("not json", encoding="utf-8")
+    assert Calibration.load(str(path)) is None
+
+def test_load_or_run_uses_cache(monkeypatch):
+    Calibration({op: 2 for op in CommandFactory.operation_map}).save()
+    def fail(*_args, **_kwargs):
+        raise AssertionError("calibration should not run")
+    monkeypatch.setattr(Calibration, "run", fail)
+    assert Calibration.load_or_run(CommandFactory.operation_map).threshold("log") == 2
+
+def test_load_or_run_recalibrates_when_incomplete(monkeypatch):
+    Calibration({"add": 2}).save()
+    monkeypatch.setattr(Calibration, "run",
+                        classmethod(lambda cls, ops: cls({op: 64 for op in ops})))
+    calibration = Calibration.load_or_run(CommandFactory.operation_map)
+    assert calibration.threshold("add") == 64
+    assert Calibration.load(cache_path()).threshold("div") == 64
+
+@pytest.mark.parametrize("size, vector", [(3, False), (4, True)])
+def test_execute_many_picks_path(monkeypatch, size, vector):
+    monkeypatch.setattr(CommandFactory, "calibration", Calibration({"sqrt": 4}))
+    cmd = CommandFactory.operation_map["sqrt"]
+    calls = []
+    monkeypatch.setattr(cmd, "execute_batch", lambda a, b: calls.append("vector") or a)
+    monkeypatch.setattr(cmd, "execute_scalar_batch", lambda a, b: calls.append("scalar") or a)
+    CommandFactory.execute_many("sqrt", [1.0] * size, [0.0] * size)
+    assert calls == ["vector" if vector else "scalar"]
+
+def test_execute_many_results():
+    results = CommandFactory.execute_many("log", [100.0, -1.0], [0.0, 0.0])
+    assert results[0] == 2.0
+    assert math.isnan(results[1])
+    assert CommandFactory.execute_many("pow", [1.0], [2.0]) is None
+    assert CommandFactory.calibration is not None
+
+def test_concurrent_first_use_calibrates_once(monkeypatch):
+    runs = []
+    def slow_run(cls, ops):
+        runs.append(threading.get_ident())
+        time.sleep(0.05)
+        return cls({op: 1 for op in ops})
+    monkeypatch.setattr(Calibration, "run", classmethod(slow_run))
+    threads = [threading.Thread(target=CommandFactory.get_calibration) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(runs) == 1
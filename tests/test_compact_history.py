@@ -0,0 +1,128 @@
+"""
+test_compact_history.py
+Tests for the deduplicated (compact) history representation.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.compact_history import CompactHistory, sequence_path
+from calculator.history_facade import HistoryFacade
+
+ROWS = [["add", 1, 2, 3], ["mul", 2, 2, 4], ["add", 1, 2, 3],
+        ["add", 1, 2, 3], ["sqrt", 9, 0, 3.0], ["mul", 2, 2, 4]]
+
+def make_frame(rows=None):
+    return pd.DataFrame(ROWS if rows is None else rows,
+                        columns=["operation", "operand1", "operand2", "result"])
+
+def test_add_deduplicates_and_expands_in_order():
+    compact = CompactHistory()
+    for row in ROWS:
+        compact.add(*row)
+    assert len(compact) == 6
+    assert compact.unique_count == 3
+    table = compact.to_frame()
+    assert list(table["count"]) == [3, 2, 1]
+    assert list(table["first_seq"]) == [0, 1, 4]
+    assert list(table["last_seq"]) == [3, 5, 4]
+    pd.testing.assert_frame_equal(compact.expand(), make_frame(), check_dtype=False)
+
+def test_from_frame_matches_incremental():
+    incremental = CompactHistory()
+    for row in ROWS:
+        incremental.add(*row)
+    vectorized = CompactHistory.from_frame(make_frame())
+    pd.testing.assert_frame_equal(vectorized.to_frame(), incremental.to_frame(),
+                                  check_dtype=False)
+    assert list(vectorized.sequence()) == list(incremental.sequence())
+    assert CompactHistory.from_frame(make_frame([])).unique_count == 0
+
+def test_save_and_load_round_trip(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    CompactHistory.from_frame(make_frame()).save(filename)
+    assert len(pd.read_csv(filename)) == 3
+    loaded = CompactHistory.load(filename)
+    pd.testing.assert_frame_equal(loaded.expand(), make_frame(), check_dtype=False)
+    (tmp_path / "history.csv.seq.npy").unlink()
+    approximate = CompactHistory.load(filename)
+    assert len(approximate) == 6
+    assert list(approximate.expand()["operation"]) == ["add"] * 3 + ["mul"] * 2 + ["sqrt"]
+
+def test_facade_compact_mode(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    make_frame().to_csv(filename, index=False)
+    hist = HistoryFacade(filename=filename, compact=True)
+    hist.load_history_async()
+    hist.add_record("add", 1, 2, 3)
+    df = hist.get_history()
+    assert len(df) == 7
+    assert hist.memory_usage()["unique_rows"] == 3
+    stats = hist.get_stats()
+    assert stats.loc["add", "count"] == 4
+    assert stats.loc["mul", "mean"] == 4
+    hist.save_history()
+    assert len(pd.read_csv(filename)) == 3
+    hist.clear_history()
+    assert hist.get_history().empty
+    hist.load_history()
+    assert len(hist.get_history()) == 7
+    hist.delete_history_file()
+    assert not (tmp_path / "history.csv").exists()
+    assert not (tmp_path / sequence_path("history.csv")).exists()
+
+def test_weighted_stats_rebuild_matches_full(tmp_path):
+    full = HistoryFacade(filename=str(tmp_path / "full.csv"))
+    compact = HistoryFacade(filename=str(tmp_path / "compact.csv"), compact=True)
+    for row in ROWS + [["div", 1, 0, float("nan")]]:
+        full.add_record(*row)
+        compact.add_record(*row)
+    full.save_history()
+    compact.save_history()
+    full.load_history()
+    compact.load_history()
+    pd.testing.assert_frame_equal(compact.get_stats(), full.get_stats(), check_dtype=False)
+    assert compact.get_stats().loc["add", "variance"] == pytest.approx(0)
+
+def test_plain_mode_expands_compact_file(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    compact = HistoryFacade(filename=filename, compact=True)
+    for row in ROWS:
+        compact.add_record(*row)
+    compact.save_history()
+    plain = HistoryFacade(filename=filename)
+    plain.load_history()
+    pd.testing.assert_frame_equal(plain.get_history(), make_frame(), check_dtype=False)
+    assert plain.get_stats().loc["add", "count"] == 3
+    plain.save_history()
+    assert len(pd.read_csv(filename)) == 6
+    assert not os.path.exists(sequence_path(filename))
+
+def test_memory_bytes_counts_index_and_does_not_cache_expansion():
+    compact = CompactHistory.from_frame(make_frame())
+    before = compact.memory_bytes()
+    assert before > len(compact) * 4
+    compact.expand()
+    assert compact.memory_bytes() == before
+    compact.add("cube", 2, 0, 8)
+    assert compact.memory_bytes() > before
+
+def test_mismatched_sequence_falls_back_to_first_seen_order(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    CompactHistory.from_frame(make_frame()).save(filename)
+    seq_file = sequence_path(filename)
+    stale = np.load(seq_file)
+    for bad in (stale[:-1], np.append(stale[:-1], 7), np.where(stale == 0, 1, stale)):
+        np.save(seq_file, bad)
+        loaded = CompactHistory.load(filename)
+        assert len(loaded) == 6
+        assert list(loaded.expand()["operation"]) == ["add"] * 3 + ["mul"] * 2 + ["sqrt"]
+    with open(seq_file, "wb") as handle:
+        handle.write(b"corrupt")
+    assert len(CompactHistory.load(filename).expand()) == 6
+
+def test_save_leaves_no_temporary_files(tmp_path):
+    filename = str(tmp_path / "history.csv")
+    CompactHistory.from_frame(make_frame()).save(filename)
+    assert sorted(os.listdir(tmp_path)) == ["history.csv", "history.csv.seq.npy"]
@@ -0,0 +1,109 @@
+"""
+test_follow.py
+Tests for tail/follow ingestion with checkpointed offsets.
+"""
+
+# pylint: disable=redefined-outer-name
+
+import json
+import os
+import pandas as pd
+import pytest
+from calculator.follow import FollowIngestor
+from calculator.repl import REPL
+
+@pytest.fixture
+def repl(tmp_path):
+    repl_instance = REPL(history_file=str(tmp_path / "history.csv"))
+    repl_instance.calculator.history.wait_until_loaded()
+    return repl_instance
+
+def operations(tmp_path):
+    """Operations persisted to the history file, in order."""
+    return list(pd.read_csv(tmp_path / "history.csv")["operation"])
+
+def test_processes_complete_lines_and_checkpoints(tmp_path, repl, capsys):
+    log = tmp_path / "ops.log"
+    log.write_text("add 1 2\nsqrt 16\nmul 2", encoding="utf-8")
+    ingestor = FollowIngestor(str(log), repl, batch_size=1)
+    assert ingestor.poll_once() == 2
+    assert operations(tmp_path) == ["add", "sqrt"]
+    assert "Result: 3.0" in capsys.readouterr().out
+    checkpoint = json.loads((tmp_path / "ops.log.checkpoint").read_text(encoding="utf-8"))
+    assert checkpoint["offset"] == len("add 1 2\nsqrt 16\n")
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write(" 5\nbogus line\n\n")
+    assert ingestor.poll_once() == 3
+    assert operations(tmp_path) == ["add", "sqrt", "mul"]
+    assert ingestor.poll_once() == 0
+    ingestor.close()
+
+def test_restart_resumes_from_checkpoint(tmp_path, repl):
+    log = tmp_path / "ops.log"
+    log.write_text("add 1 1\n", encoding="utf-8")
+    FollowIngestor(str(log), repl).run(max_idle_polls=1)
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write("sub 5 2\n")
+    restarted = FollowIngestor(str(log), repl, poll_interval=0)
+    restarted.run(max_idle_polls=1)
+    assert operations(tmp_path) == ["add", "sub"]
+
+def test_truncation_and_rotation(tmp_path, repl):
+    log = tmp_path / "ops.log"
+    log.write_text("add 1 1\nadd 2 2\n", encoding="utf-8")
+    ingestor = FollowIngestor(str(log), repl, checkpoint_path=str(tmp_path / "cp.json"))
+    ingestor.poll_once()
+    log.write_text("cube 2\n", encoding="utf-8")
+    assert ingestor.poll_once() == 1
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write("square 3\n")
+    os.rename(log, tmp_path / "ops.log.1")
+    log.write_text("log 100\n", encoding="utf-8")
+    assert ingestor.poll_once() == 2
+    assert operations(tmp_path) == ["add", "add", "cube", "square", "log"]
+    ingestor.close()
+
+def test_missing_file_and_bad_checkpoint(tmp_path, repl):
+    checkpoint = tmp_path / "cp.json"
+    checkpoint.write_text("not json", encoding="utf-8")
+    ingestor = FollowIngestor(str(tmp_path / "missing.log"), repl,
+                              checkpoint_path=str(checkpoint))
+    assert ingestor.offset == 0
+    assert ingestor.poll_once() == 0
+
+def make_repl(tmp_path):
+    """A fresh REPL on the shared history file, as after a process restart."""
+    repl_instance = REPL(history_file=str(tmp_path / "history.csv"))
+    repl_instance.calculator.history.wait_until_loaded()
+    return repl_instance
+
+def test_history_survives_restart_exactly_once(tmp_path):
+    log = tmp_path / "ops.log"
+    log.write_text("add 1 1\nmul 2 3\n", encoding="utf-8")
+    first = make_repl(tmp_path)
+    FollowIngestor(str(log), first, poll_interval=0).run(max_idle_polls=1)
+    assert operations(tmp_path) == ["add", "mul"]
+    assert first.calculator.history.get_history().empty  # Flushed rows are released.
+    with open(log, "a", encoding="utf-8") as handle:
+        handle.write("sub 5 2\n")
+    FollowIngestor(str(log), make_repl(tmp_path), poll_interval=0).run(max_idle_polls=1)
+    history = pd.read_csv(tmp_path / "history.csv")
+    assert list(history["operation"]) == ["add", "mul", "sub"]
+    assert list(history["result"]) == [2.0, 6.0, 3.0]
+
+def test_interrupt_mid_batch_commits_processed_lines(tmp_path, monkeypatch):
+    log = tmp_path / "ops.log"
+    log.write_text("add 1 1\nadd 2 2\ncube 2\nsquare 3\n", encoding="utf-8")
+    ingestor = FollowIngestor(str(log), make_repl(tmp_path))
+    real_dispatch = ingestor.dispatch
+    def interrupt_on_cube(line):
+        if line.startswith("cube"):
+            raise KeyboardInterrupt
+        real_dispatch(line)
+    monkeypatch.setattr(ingestor, "dispatch", interrupt_on_cube)
+    with pytest.raises(KeyboardInterrupt):
+        ingestor.run()
+    assert operations(tmp_path) == ["add", "add"]
+    assert ingestor.offset == len("add 1 1\nadd 2 2\n")
+    FollowIngestor(str(log), make_repl(tmp_path), poll_interval=0).run(max_idle_polls=1)
+    assert operations(tmp_path) == ["add", "add", "cube", "square"]
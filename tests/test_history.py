@@ -3,6 +3,7 @@ test_history.py
 Tests the HistoryFacade's ability to save, load, clear, and delete CSV files.
 """
 
+import threading
 import pandas as pd
 from calculator.history_facade import HistoryFacade
 
@@ -27,6 +28,23 @@ def test_save_history(tmp_path):
     assert len(loaded_df) == 1
     assert loaded_df.loc[0, "operation"] == "sub"
 
+def test_flush_appends_only_new_records(tmp_path):
+    fake_csv = tmp_path / "history.csv"
+    fake_csv.write_text("operation,operand1,operand2,result\nadd,2,3,5\n", encoding="utf-8")
+    hist = HistoryFacade(filename=str(fake_csv))
+    hist.load_history()
+    hist.add_record("mul", 2, 4, 8)
+    hist.flush()
+    hist.flush()
+    assert list(pd.read_csv(fake_csv)["operation"]) == ["add", "mul"]
+    hist.add_record("sub", 9, 4, 5)
+    hist.flush(release=True)
+    assert hist.get_history().empty
+    assert hist.get_stats().loc["sub", "count"] == 1
+    hist.add_record("cube", 2, 0, 8)
+    hist.flush()
+    assert list(pd.read_csv(fake_csv)["operation"]) == ["add", "mul", "sub", "cube"]
+
 def test_clear_history():
     hist = HistoryFacade(filename="test_clear.csv")
     hist.add_record("mul", 3, 4, 12)
@@ -42,3 +60,32 @@ def test_delete_history_file(tmp_path):
     assert fake_csv.exists()
     hist.delete_history_file()
     assert not fake_csv.exists()
+
+def test_load_history_async_buffers_new_records(tmp_path, monkeypatch):
+    fake_csv = tmp_path / "history.csv"
+    fake_csv.write_text("operation,operand1,operand2,result\nadd,2,3,5\nmul,2,4,8",
+                        encoding="utf-8")
+    hist = HistoryFacade(filename=str(fake_csv), chunk_size=1)
+    release = threading.Event()
+    original_read = hist._read_history  # pylint: disable=protected-access
+
+    def blocked_read():
+        release.wait()
+        return original_read()
+
+    monkeypatch.setattr(hist, "_read_history", blocked_read)
+    hist.load_history_async()
+    assert hist.is_loading
+    hist.add_record("sub", 9, 4, 5)
+    release.set()
+    df = hist.get_history()
+    assert not hist.is_loading
+    assert hist.load_progress() == 2
+    assert list(df["operation"]) == ["add", "mul", "sub"]
+
+def test_load_history_async_missing_file(tmp_path):
+    hist = HistoryFacade(filename=str(tmp_path / "missing.csv"))
+    hist.load_history_async()
+    hist.add_record("add", 1, 1, 2)
+    assert hist.wait_until_loaded(timeout=5)
+    assert len(hist.get_history()) == 1
@@ -0,0 +1,64 @@
+"""
+test_history_stats.py
+Tests for the running per-operation history aggregates.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from calculator.exceptions import DivisionByZeroError
+from calculator.history_facade import HistoryFacade
+from calculator.history_stats import HistoryStats
+from calculator.main_logic import CalculatorApp
+
+def test_incremental_matches_numpy(tmp_path):
+    hist = HistoryFacade(filename=str(tmp_path / "history.csv"))
+    values = [3.0, 7.5, -2.0, 10.0, 4.25]
+    for value in values:
+        hist.add_record("add", value, 0, value)
+    hist.add_record("div", 1, 4, 0.25)
+    entry = hist.stats.get("add")
+    assert entry.count == 5
+    assert math.isclose(entry.total, sum(values))
+    assert math.isclose(entry.mean, np.mean(values))
+    assert math.isclose(entry.variance, np.var(values))
+    assert (entry.minimum, entry.maximum) == (-2.0, 10.0)
+    assert hist.stats.get("div").count == 1
+
+def test_rebuild_matches_incremental():
+    rows = [["add", 1, 2, 3], ["mul", 2, 5, 10], ["add", 4, 4, 8],
+            ["div", 1, 0, "nan"], ["add", 0.5, 0, 0.5]]
+    incremental = HistoryStats()
+    for operation, _a, _b, result in rows:
+        incremental.update(operation, result)
+    rebuilt = HistoryStats()
+    rebuilt.rebuild(pd.DataFrame(rows, columns=["operation", "operand1", "operand2", "result"]))
+    pd.testing.assert_frame_equal(incremental.to_frame(), rebuilt.to_frame(), check_dtype=False)
+    assert rebuilt.get("div").error_count == 1
+    assert rebuilt.get("div").count == 0
+
+def test_stats_follow_load_and_clear(tmp_path):
+    fake_csv = tmp_path / "history.csv"
+    fake_csv.write_text("operation,operand1,operand2,result\nadd,2,3,5\nadd,1,1,2\nsqrt,9,0,3",
+                        encoding="utf-8")
+    hist = HistoryFacade(filename=str(fake_csv))
+    hist.load_history_async()
+    hist.add_record("add", 5, 5, 10)
+    stats = hist.get_stats()
+    assert stats.loc["add", "count"] == 3
+    assert stats.loc["add", "max"] == 10
+    hist.clear_history()
+    assert hist.get_stats().empty
+    hist.load_history()
+    assert hist.get_stats().loc["sqrt", "mean"] == 3
+
+def test_errors_are_counted(tmp_path):
+    app = CalculatorApp(history_file=str(tmp_path / "history.csv"))
+    app.history.wait_until_loaded()
+    app.perform_operation("div", 6, 3)
+    with pytest.raises(DivisionByZeroError):
+        app.perform_operation("div", 1, 0)
+    stats = app.history.get_stats()
+    assert stats.loc["div", "count"] == 1
+    assert stats.loc["div", "errors"] == 1
@@ -0,0 +1,54 @@
+"""
+test_loadgen.py
+Tests for the REPL load generator and soak test.
+"""
+
+import pytest
+from calculator import loadgen
+from calculator.loadgen import SoakReport, WorkloadGenerator, main, run_soak
+
+def test_generator_is_deterministic_and_covers_mix():
+    first = [WorkloadGenerator(seed=3).next_command() for _ in range(5)]
+    gen_a, gen_b = WorkloadGenerator(seed=3), WorkloadGenerator(seed=3)
+    assert [gen_a.next_command() for _ in range(50)] == [gen_b.next_command() for _ in range(50)]
+    assert first
+    trig_only = WorkloadGenerator(mix={"trig": 1.0}, seed=1).next_command()
+    assert trig_only[0] == "trig" and len(trig_only) == 2
+
+def test_run_soak_by_lines():
+    report = run_soak(max_lines=200, seed=5)
+    assert 100 <= report.commands <= 200
+    assert report.ops_per_second > 0
+    assert report.peak_rss > 0
+    pcts = report.percentiles()
+    assert pcts[50] <= pcts[90] <= pcts[99]
+    text = report.format()
+    assert "Latency: p50=" in text and "Throughput ratio" in text
+
+def test_peak_rss_uses_high_water_mark(monkeypatch):
+    monkeypatch.setattr(loadgen, "current_rss_bytes", lambda: 1000)
+    monkeypatch.setattr(loadgen, "peak_rss_bytes", lambda: 5000)
+    assert run_soak(max_lines=20, seed=1).peak_rss == 5000
+
+def test_run_soak_by_duration():
+    report = run_soak(duration=0.3, mix={"arithmetic": 1.0}, seed=2, window=0.1)
+    assert report.commands > 0
+    assert report.timeline()
+
+def test_run_soak_requires_budget():
+    with pytest.raises(ValueError):
+        run_soak()
+
+def test_decay_detection():
+    steady = SoakReport(list(range(1, 21)), [0.001] * 20, 0)
+    assert not steady.decayed
+    slowing = SoakReport(list(range(1, 21)), [0.001] * 10 + [0.005] * 10, 0)
+    assert slowing.decay_ratio() == pytest.approx(0.2)
+    assert slowing.decayed
+    assert SoakReport([], [], 0).format().startswith("Commands: 0")
+
+def test_main_cli(capsys):
+    assert main(["--lines", "50", "--seed", "1"]) in (0, 1)
+    assert "Commands:" in capsys.readouterr().out
+    with pytest.raises(SystemExit):
+        main([])
@@ -14,8 +14,37 @@ def test_main_exit(monkeypatch, capsys):
     # Provide a single 'exit' input so the REPL will quit immediately.
     monkeypatch.setattr("builtins.input", lambda prompt="": "exit")
     with pytest.raises(SystemExit) as excinfo:
-        main()
+        main([])
     output = capsys.readouterr().out
     # Check for the REPL welcome message
     assert "Welcome to the Advanced Calculator REPL!" in output
     assert excinfo.value.code == 0
+
+def test_main_async_exit(monkeypatch, capsys):
+    """The --async flag starts the asyncio REPL."""
+    monkeypatch.setattr("builtins.input", lambda prompt="": "exit")
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--async"])
+    assert "Welcome to the Advanced Calculator REPL!" in capsys.readouterr().out
+    assert excinfo.value.code == 0
+
+def test_main_follow(tmp_path, monkeypatch, capsys):
+    """--follow processes the file until interrupted."""
+    log = tmp_path / "ops.log"
+    log.write_text("add 20 22\n", encoding="utf-8")
+
+    def interrupt(_seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("time.sleep", interrupt)
+    main(["--follow", str(log), "--checkpoint", str(tmp_path / "cp.json")])
+    out = capsys.readouterr().out
+    assert "Result: 42.0" in out
+    assert "Stopped following" in out
+
+def test_main_calibrate(capsys):
+    """--calibrate re-runs the dispatch benchmark and prints the thresholds."""
+    main(["--calibrate"])
+    output = capsys.readouterr().out
+    assert "Scalar/vector thresholds for" in output
+    assert "sqrt" in output
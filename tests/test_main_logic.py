@@ -10,3 +10,9 @@ def test_unsupported_operation():
     # When an unsupported operation is requested, perform_operation should return None.
     result = app.perform_operation("nonexistent", 1, 2)
     assert result is None
+
+def test_compact_history_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_COMPACT", "1")
+    app = CalculatorApp(history_file=str(tmp_path / "history.csv"))
+    assert app.history.is_compact
+    assert not CalculatorApp(str(tmp_path / "other.csv"), compact_history=False).history.is_compact
@@ -0,0 +1,66 @@
+"""
+test_memstats.py
+Tests for memory accounting and allocation tracing.
+"""
+
+import pytest
+from calculator import memstats
+from calculator.history_facade import HistoryFacade
+from calculator.plugins import trig_plugin
+
+def test_rss_values_are_reported():
+    assert memstats.current_rss_bytes() > 0
+    assert memstats.peak_rss_bytes() >= memstats.current_rss_bytes() // 2
+
+def test_collect_includes_history_usage(tmp_path):
+    hist = HistoryFacade(filename=str(tmp_path / "history.csv"))
+    empty_bytes = hist.memory_usage()["dataframe_bytes"]
+    for i in range(50):
+        hist.add_record("add", i, i, 2 * i)
+    stats = memstats.collect(hist)
+    assert stats["history"]["rows"] == 50
+    assert stats["history"]["dataframe_bytes"] > empty_bytes
+    assert stats["history"]["pending_records"] == 0
+    text = memstats.format_stats(stats)
+    assert "Current RSS:" in text and "History rows: 50" in text
+
+def test_collect_reports_cache_sizes(tmp_path):
+    trig_plugin.clear_cache()
+    trig_plugin.trig_value("sin", 17)
+    trig_plugin.trig_value("sin", 17)
+    hist = HistoryFacade(filename=str(tmp_path / "history.csv"), compact=True)
+    for _ in range(3):
+        hist.add_record("add", 1, 2, 3)
+    stats = memstats.collect(hist)
+    assert stats["caches"]["trig_plugin"] == {
+        "entries": 1, "max_entries": 1024, "hits": 1, "misses": 1,
+    }
+    assert stats["caches"]["compact_key_index"]["entries"] == 1
+    assert stats["caches"]["compact_key_index"]["bytes"] > 0
+    text = memstats.format_stats(stats)
+    assert "Cache trig_plugin: entries 1, max entries 1024, hits 1, misses 1" in text
+    assert "Cache compact_key_index: entries 1, bytes " in text
+
+def test_format_bytes():
+    assert memstats.format_bytes(None) == "n/a"
+    assert memstats.format_bytes(512) == "512 B"
+    assert memstats.format_bytes(2048) == "2.0 KB"
+    assert memstats.format_bytes(3 * 1024 ** 3) == "3.0 GB"
+
+def test_allocation_tracer_diff():
+    tracer = memstats.AllocationTracer()
+    with pytest.raises(RuntimeError):
+        tracer.top()
+    tracer.start()
+    try:
+        with pytest.raises(RuntimeError):
+            tracer.diff()
+        tracer.snapshot()
+        retained = [bytearray(1024) for _ in range(200)]
+        diff = tracer.diff(limit=5)
+        assert retained and diff
+        assert any("test_memstats.py" in line for line in diff)
+        assert tracer.top(limit=3)
+    finally:
+        tracer.stop()
+    assert not tracer.is_tracing
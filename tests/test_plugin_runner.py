@@ -0,0 +1,101 @@
+"""
+test_plugin_runner.py
+Tests for running plugins in isolated worker processes.
+
+The plugin classes below are imported by name inside the workers.
+"""
+
+# pylint: disable=redefined-outer-name
+
+import os
+import time
+import pytest
+from calculator.exceptions import PluginExecutionError, PluginTimeoutError
+from calculator.plugin_runner import PluginProcessPool, _PluginWorker
+
+class PidPlugin:
+    command_name = "pid"
+
+    def execute(self):
+        print(os.getpid())
+
+class EchoPlugin:
+    command_name = "echo"
+
+    def execute(self):
+        print(f"echo: {input('> ')}")
+
+class SlowPlugin:
+    command_name = "slow"
+
+    def execute(self):
+        time.sleep(30)
+
+class BrokenPlugin:
+    command_name = "broken"
+
+    def execute(self):
+        raise RuntimeError("plugin exploded")
+
+@pytest.fixture
+def pool():
+    plugin_pool = PluginProcessPool(timeout=10, max_calls=2)
+    yield plugin_pool
+    plugin_pool.shutdown()
+
+def test_trig_plugin_runs_isolated(pool):
+    output = pool.execute("calculator.plugins.trig_plugin", ["cos 60"])
+    assert output.startswith("cos(60°) =")
+
+def test_input_lines_are_fed_to_plugin(pool):
+    assert pool.execute(__name__, ["hello"], "EchoPlugin") == "echo: hello\n"
+
+def test_worker_is_separate_process_and_recycled(pool):
+    first = int(pool.execute(__name__, class_name="PidPlugin"))
+    second = int(pool.execute(__name__, class_name="PidPlugin"))
+    third = int(pool.execute(__name__, class_name="PidPlugin"))
+    assert first == second != os.getpid()
+    assert third != first
+
+def test_plugin_exception_is_marshalled(pool):
+    with pytest.raises(PluginExecutionError, match="RuntimeError: plugin exploded"):
+        pool.execute(__name__, class_name="BrokenPlugin")
+    with pytest.raises(PluginExecutionError, match="EOFError"):
+        pool.execute(__name__, [], "EchoPlugin")
+
+def test_timeout_kills_and_replaces_worker(pool):
+    pool.timeout = 0.5
+    with pytest.raises(PluginTimeoutError):
+        pool.execute(__name__, class_name="SlowPlugin")
+    pool.timeout = 10
+    assert pool.execute(__name__, ["still alive"], "EchoPlugin") == "echo: still alive\n"
+
+def test_worker_killed_between_calls_is_replaced(pool):
+    first = int(pool.execute(__name__, class_name="PidPlugin"))
+    worker = pool._idle.queue[0]  # pylint: disable=protected-access
+    worker.process.kill()
+    worker.process.join()
+    second = int(pool.execute(__name__, class_name="PidPlugin"))
+    assert second != first
+
+def test_worker_dying_mid_call_raises_and_pool_recovers(pool, monkeypatch):
+    pool.execute(__name__, class_name="PidPlugin")
+    worker = pool._idle.queue[0]  # pylint: disable=protected-access
+    worker.process.kill()
+    worker.process.join()
+    # Pretend the worker was still alive when it was picked, so the call itself fails.
+    monkeypatch.setattr(worker.process, "is_alive", lambda: True)
+    with pytest.raises(PluginExecutionError, match="exited unexpectedly"):
+        pool.execute(__name__, class_name="PidPlugin")
+    assert pool.execute(__name__, ["ok"], "EchoPlugin") == "echo: ok\n"
+
+def test_interrupted_call_does_not_leak_its_reply(pool, monkeypatch):
+    real_call = _PluginWorker.call
+    def interrupted(worker, request, _timeout):
+        worker.conn.send(request)
+        raise KeyboardInterrupt
+    monkeypatch.setattr(_PluginWorker, "call", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        pool.execute(__name__, ["first"], "EchoPlugin")
+    monkeypatch.setattr(_PluginWorker, "call", real_call)
+    assert pool.execute(__name__, ["second"], "EchoPlugin") == "echo: second\n"
@@ -151,3 +151,67 @@ def test_plugin_load_error(monkeypatch):
     new_repl = REPL()
     # Confirm no crash
     assert len(new_repl.plugins) == 0
+
+def test_cmd_replay(make_fresh_repl, capsys):
+    make_fresh_repl.calculator.perform_operation("add", 2, 3)
+    make_fresh_repl.cmd_replay(["replay"])
+    out = capsys.readouterr().out
+    assert "Replayed 1 rows" in out
+    assert "All results reproduced." in out
+    make_fresh_repl.cmd_replay(["replay", "abc"])
+    assert "tolerance must be numeric" in capsys.readouterr().out
+
+def test_isolated_plugin_command(monkeypatch, capsys):
+    monkeypatch.setenv("ISOLATED_PLUGINS", "trig")
+    repl_inst = REPL()
+    assert repl_inst.isolated_plugins == {"trig"}
+    try:
+        assert repl_inst.handle_plugin_command("trig", ["trig", "sin", "30"]) is True
+        assert "sin(30°) =" in capsys.readouterr().out
+        repl_inst.handle_plugin_command("trig", ["trig"])
+        assert "more input than was supplied" in capsys.readouterr().out
+    finally:
+        repl_inst.plugin_pool.shutdown()
+
+def test_history_command_waits_for_background_load(make_fresh_repl, capsys, monkeypatch):
+    history = make_fresh_repl.calculator.history
+    monkeypatch.setattr(type(history), "is_loading", property(lambda _self: True))
+    make_fresh_repl.wait_for_history()
+    assert "History is still loading" in capsys.readouterr().out
+
+def test_cmd_memstats(make_fresh_repl, capsys):
+    make_fresh_repl.cmd_memstats(["memstats"])
+    assert "Current RSS:" in capsys.readouterr().out
+    make_fresh_repl.cmd_memstats(["memstats", "trace", "diff"])
+    assert "Error:" in capsys.readouterr().out
+    try:
+        for action in ["start", "snapshot", "diff", "top"]:
+            make_fresh_repl.cmd_memstats(["memstats", "trace", action])
+        assert "Baseline snapshot taken." in capsys.readouterr().out
+    finally:
+        make_fresh_repl.cmd_memstats(["memstats", "trace", "stop"])
+    make_fresh_repl.cmd_memstats(["memstats", "bogus"])
+    assert "Usage: memstats" in capsys.readouterr().out
+
+def test_cmd_history_stats(make_fresh_repl, capsys):
+    make_fresh_repl.handle_arithmetic_command("add", ["add", "2", "3"])
+    make_fresh_repl.handle_arithmetic_command("add", ["add", "4", "5"])
+    capsys.readouterr()
+    make_fresh_repl.cmd_history(["history", "stats"])
+    out = capsys.readouterr().out
+    assert "add" in out and "variance" in out
+
+def test_cmd_let_and_vars(make_fresh_repl, capsys):
+    make_fresh_repl.dispatch("vars")
+    assert "No variables defined." in capsys.readouterr().out
+    make_fresh_repl.dispatch("let x = add 2 3 ; y = square x")
+    out = capsys.readouterr().out
+    assert "x = 5.0" in out and "y = 25.0" in out
+    make_fresh_repl.dispatch("let x = 4")
+    assert "y = 16.0" in capsys.readouterr().out
+    make_fresh_repl.dispatch("let bad")
+    assert "Usage: let" in capsys.readouterr().out
+    make_fresh_repl.dispatch("let q = sqrt missing")
+    assert "Undefined variable" in capsys.readouterr().out
+    make_fresh_repl.dispatch("vars")
+    assert "x = 4.0" in capsys.readouterr().out
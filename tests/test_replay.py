@@ -0,0 +1,56 @@
+"""
+test_replay.py
+Tests for replaying history against the current command implementations.
+"""
+
+import pandas as pd
+from calculator.commands import DivCommand, SqrtCommand, LogCommand
+from calculator.replay import HistoryReplayer
+
+def make_history(rows):
+    return pd.DataFrame(rows, columns=["operation", "operand1", "operand2", "result"])
+
+def test_execute_batch_invalid_inputs_are_nan():
+    assert pd.isna(DivCommand().execute_batch([1.0], [0.0])[0])
+    assert pd.isna(SqrtCommand().execute_batch([-4.0], [0.0])[0])
+    assert pd.isna(LogCommand().execute_batch([0.0], [0.0])[0])
+    assert list(SqrtCommand().execute_batch([16.0, 9.0], [0, 0])) == [4.0, 3.0]
+
+def test_replay_all_reproduced():
+    history = make_history([
+        ["add", 2, 3, 5], ["div", 10, 4, 2.5], ["sqrt", 16, 0, 4.0],
+        ["log", 100, 0, 2.0], ["add", 1.5, 1.5, 3.0],
+    ])
+    report = HistoryReplayer().replay(history)
+    assert report.total_rows == 5
+    assert report.mismatch_count == 0
+    assert report.summary["add"]["rows"] == 2
+    assert "All results reproduced." in report.format()
+
+def test_replay_reports_mismatches_with_row_ids():
+    history = make_history([
+        ["add", 2, 3, 5], ["mul", 2, 3, 7], ["cube", 2, 0, 8], ["mul", 4, 4, 16],
+    ])
+    report = HistoryReplayer(chunk_size=1).replay(history)
+    assert report.mismatch_count == 1
+    mismatch = report.mismatches[0]
+    assert mismatch["row_id"] == 1
+    assert mismatch["replayed"] == 6
+    assert report.summary["mul"] == {
+        "rows": 2, "mismatches": 1, "max_abs_error": 1.0,
+        "seconds": report.summary["mul"]["seconds"], "known": True,
+    }
+    assert "row 1: mul" in report.format()
+
+def test_replay_tolerance_and_unknown_operation():
+    history = make_history([["div", 1, 3, 0.3333], ["pow", 2, 3, 8]])
+    assert HistoryReplayer(tolerance=1e-3).replay(history).summary["div"]["mismatches"] == 0
+    report = HistoryReplayer(tolerance=1e-9).replay(history)
+    assert report.summary["div"]["mismatches"] == 1
+    assert report.summary["pow"]["known"] is False
+    assert "(unknown operation)" in report.format()
+
+def test_replay_empty_history():
+    report = HistoryReplayer().replay(make_history([]))
+    assert report.total_rows == 0
+    assert report.rows_per_second == 0.0
@@ -4,7 +4,9 @@ Tests for the trigonometry plugin.
 """
 
 import math
-from calculator.plugins.trig_plugin import PluginCommand
+from calculator.plugins.trig_plugin import (
+    PluginCommand, cache_info, clear_cache, reduce_angle, trig_value
+)
 
 def run_trig_test(monkeypatch, capsys, user_input):
     monkeypatch.setattr('builtins.input', lambda prompt='': user_input)
@@ -93,3 +95,44 @@ def test_sec_zero(monkeypatch, capsys):
 def test_csc_zero(monkeypatch, capsys):
     output = run_trig_test(monkeypatch, capsys, "csc 0")
     assert "undefined" in output.lower()
+
+def test_tan_undefined(monkeypatch, capsys):
+    output = run_trig_test(monkeypatch, capsys, "tan 90")
+    assert "Tangent is undefined" in output
+
+def test_special_angles_are_exact():
+    assert trig_value("sin", 30) == 0.5
+    assert trig_value("cos", 60) == 0.5
+    assert trig_value("tan", 45) == 1.0
+    assert trig_value("sec", 60) == 2.0
+    assert trig_value("csc", 210) == -2.0
+    assert trig_value("cos", 90) == 0.0
+    assert trig_value("sin", 180) == 0.0
+    assert trig_value("tan", 135) == -1.0
+
+def test_undefined_points_are_exact():
+    for angle in (90, 270, -90, 450):
+        assert trig_value("tan", angle) is None
+        assert trig_value("sec", angle) is None
+    for angle in (0, 180, 360, -180, 720):
+        assert trig_value("cot", angle) is None
+        assert trig_value("csc", angle) is None
+    assert trig_value("tan", 89.999) is not None
+
+def test_range_reduction():
+    assert reduce_angle(390) == 30
+    assert reduce_angle(-30) == 330
+    assert reduce_angle(-1e-20) == 0.0
+    assert trig_value("sin", 3630) == 0.5
+    assert math.isclose(trig_value("sin", 370.5), math.sin(math.radians(10.5)))
+
+def test_repeated_queries_are_cached():
+    clear_cache()
+    trig_value("cos", 17)
+    trig_value("cos", 17)
+    trig_value("sin", 30)
+    trig_value("sin", 30)
+    assert trig_value("tan", 90) is None
+    assert trig_value("tan", 90) is None
+    info = cache_info()
+    assert (info.misses, info.hits) == (3, 3)
@@ -0,0 +1,85 @@
+"""
+test_variables.py
+Tests for named variables and incremental recomputation.
+"""
+
+import pytest
+from calculator.exceptions import CalculatorError
+from calculator.variables import VariableGraph
+
+def make_chain():
+    graph = VariableGraph()
+    graph.define("x", ["add", "2", "3"])
+    graph.define("y", ["sqrt", "x"])
+    graph.define("z", ["mul", "y", "y"])
+    graph.define("w", ["10"])
+    return graph
+
+def test_define_and_get():
+    graph = make_chain()
+    assert graph.get("x") == 5
+    assert graph.get("z") == pytest.approx(5)
+    assert graph.get("w") == 10
+    assert "y" in graph
+
+def test_only_downstream_nodes_recompute_in_order():
+    graph = make_chain()
+    w_binding = graph.bindings["w"]
+    assert graph.define("x", ["16"]) == ["x", "y", "z"]
+    assert graph.get("z") == 16
+    assert graph.bindings["w"] is w_binding
+
+def test_bulk_update_single_pass():
+    graph = make_chain()
+    graph.define("v", ["add", "w", "x"])
+    recomputed = graph.define_many([("x", ["4"]), ("w", ["1"])])
+    assert sorted(recomputed) == ["v", "w", "x", "y", "z"]
+    assert recomputed.index("x") < recomputed.index("y") < recomputed.index("z")
+    assert len(recomputed) == len(set(recomputed))
+    assert graph.get("v") == 5
+
+def test_errors_propagate_and_clear():
+    graph = make_chain()
+    graph.define("x", ["-4"])
+    with pytest.raises(CalculatorError):
+        graph.get("z")
+    assert graph.describe(["z"]) == ["z = Error: depends on 'y', which failed"]
+    graph.define("x", ["9"])
+    assert graph.get("z") == pytest.approx(9)
+
+def test_invalid_definitions():
+    graph = make_chain()
+    with pytest.raises(ValueError, match="Circular"):
+        graph.define("x", ["add", "z", "1"])
+    with pytest.raises(ValueError, match="Undefined"):
+        graph.define("a", ["sqrt", "nope"])
+    with pytest.raises(ValueError, match="Unknown operation"):
+        graph.define("a", ["pow", "2", "3"])
+    with pytest.raises(ValueError, match="Invalid variable"):
+        graph.define("1a", ["2"])
+    with pytest.raises(ValueError, match="takes 2 argument"):
+        graph.define("a", ["add"])
+    assert graph.get("x") == 5
+
+def test_arity_matches_repl_commands():
+    graph = make_chain()
+    with pytest.raises(ValueError, match=r"'add' takes 2 argument\(s\), got 1"):
+        graph.define("v", ["add", "x"])
+    with pytest.raises(ValueError, match=r"'sqrt' takes 1 argument\(s\), got 2"):
+        graph.define("v", ["sqrt", "x", "5"])
+    with pytest.raises(ValueError, match="got 3"):
+        graph.define("v", ["mul", "x", "2", "3"])
+    assert "v" not in graph
+
+def test_names_that_cannot_be_referenced_are_rejected():
+    graph = VariableGraph()
+    for name in ("inf", "nan", "Infinity"):
+        with pytest.raises(ValueError, match="is a number"):
+            graph.define(name, ["2"])
+    for name in ("log", "add", "SQRT"):
+        with pytest.raises(ValueError, match="is an operation"):
+            graph.define(name, ["5"])
+    assert not graph.bindings
+    graph.define("info", ["2"])
+    graph.define("logx", ["add", "info", "1"])
+    assert graph.get("logx") == 3